@@ -7,12 +7,14 @@ success/fail counts and returns a new beta (difficulty) along with diagnostics.
 
 import logging
 import math
-from dataclasses import dataclass
-from functools import lru_cache
+import threading
+from typing import TYPE_CHECKING, NamedTuple
 
-from IRT_Bases.Fail import get_fail_rate
-from IRT_Bases.Success import get_success_rate
+from IRT_Bases.Fail import MAX_FAILS, get_fail_rate
+from IRT_Bases.Success import MAX_ATTEMPTS, get_success_rate
 from algo_config import (
+    BETA_MAX,
+    BETA_MIN,
     MAX_BETA_STEP,
     MOMENTUM_FACTOR_DEFAULT,
     STABILITY_THRESHOLD_DEFAULT,
@@ -20,29 +22,132 @@ from algo_config import (
     difficulty_from_beta,
 )
 
+if TYPE_CHECKING:
+    from IRT_Algo import IRTProbability, IRTResult
+
 logger = logging.getLogger(__name__)
 
 
-@dataclass(frozen=True)
-class SuccessMetrics:
+class SuccessMetrics(NamedTuple):
     level: str
     success_rate: float
     consistency: float
     bias: float
 
 
-@dataclass(frozen=True)
-class FailMetrics:
+class FailMetrics(NamedTuple):
     level: str
     fail_rate: float
     penalty: float
     normalized_fail: float
 
 
-@dataclass(frozen=True)
-class IRTSnapshot:
-    probability: float
-    theta: float
+class DDAState(NamedTuple):
+    previous_beta: float | None
+    momentum: float
+
+
+_INITIAL_STATE = DDAState(None, 0.0)
+
+
+def _build_success_metrics(success_count: int) -> SuccessMetrics:
+    try:
+        level, normalized_value, bias = get_success_rate(success_count)
+    except (ValueError, TypeError):
+        level, normalized_value, bias = "Unknown", 0.5, 0.0
+
+    success_rate = round(normalized_value, 3)
+    consistency = round(min(1.0, normalized_value + bias), 3)
+    return SuccessMetrics(level, success_rate, consistency, bias)
+
+
+def _build_fail_metrics(fail_count: int) -> FailMetrics:
+    try:
+        fail_level, fail_value, fail_penalty = get_fail_rate(fail_count)
+    except (ValueError, TypeError):
+        fail_level, fail_value, fail_penalty = "Unknown", 0.0, 0.0
+
+    normalized_fail = round(min(1.0, fail_value + fail_penalty), 3)
+    return FailMetrics(fail_level, fail_value, fail_penalty, normalized_fail)
+
+
+# Counts saturate at MAX_ATTEMPTS / MAX_FAILS, so these cover every input.
+_SUCCESS_TABLE = tuple(_build_success_metrics(i) for i in range(MAX_ATTEMPTS + 1))
+_FAIL_TABLE = tuple(_build_fail_metrics(i) for i in range(MAX_FAILS + 1))
+
+
+def _count_index(count: int, max_count: int) -> int:
+    """Clamp a raw success/fail count to a table row in [0, max_count]."""
+    if not isinstance(count, int) or count < 0:
+        return 0
+    return count if count < max_count else max_count
+
+
+def _sanitize_inputs(
+    beta_old: float, success_count: int, fail_count: int
+) -> tuple[float, int, int]:
+    """Clamp beta to [BETA_MIN, BETA_MAX] and counts to >= 0 in one call."""
+    if beta_old < BETA_MIN:
+        beta_old = BETA_MIN
+    elif beta_old > BETA_MAX:
+        beta_old = BETA_MAX
+    return (
+        beta_old,
+        success_count if success_count > 0 else 0,
+        fail_count if fail_count > 0 else 0,
+    )
+
+
+def _dda_step(
+    beta_old: float,
+    probability: float,
+    theta: float,
+    target_performance: float,
+    adjustment_rate: float,
+    behavior_weight: float,
+    momentum: float,
+    momentum_factor: float,
+    stability_threshold: float,
+    previous_beta: float | None,
+    max_step: float = MAX_BETA_STEP,
+) -> tuple[float, float]:
+    """
+    Fused scalar pipeline for one DDA update.
+
+    Runs sensitivity scaling, behavior weighting, the stability gate, the
+    momentum EMA, the recently-stable slowdown, the tanh proposal and the
+    per-step cap in a single frame. Returns ``(beta_new, momentum)``.
+    """
+    performance_gap = target_performance - probability
+
+    # Sensitivity (strong players move less per step) and behavior weighting
+    # are applied as one product.
+    if theta < -3.0:
+        theta = -3.0
+    elif theta > 3.0:
+        theta = 3.0
+    beta_adjustment = (
+        adjustment_rate * performance_gap * (1 - theta / 6.0) * (1 + behavior_weight * 0.3)
+    )
+
+    # Stability gate: ignore gaps inside the dead band.
+    if abs(performance_gap) < stability_threshold:
+        beta_adjustment = 0.0
+
+    momentum = momentum_factor * momentum + (1 - momentum_factor) * beta_adjustment
+    beta_adjustment += momentum * 0.5
+
+    if (
+        previous_beta is not None
+        and abs(beta_old - previous_beta) < stability_threshold
+    ):
+        beta_adjustment *= 0.4
+
+    proposed = clamp_beta(beta_old + math.tanh(beta_adjustment) * 0.8)
+    if abs(proposed - beta_old) > max_step:
+        direction = 1 if proposed > beta_old else -1
+        proposed = beta_old + direction * max_step
+    return clamp_beta(proposed), momentum
 
 
 class DDASystem:
@@ -52,6 +157,7 @@ class DDASystem:
         "_momentum",
         "_stability_threshold",
         "_momentum_factor",
+        "_state_lock",
     )
 
     def __init__(
@@ -63,110 +169,44 @@ class DDASystem:
         self._momentum: float = 0.0
         self._stability_threshold = stability_threshold
         self._momentum_factor = momentum_factor
-
-    @lru_cache(maxsize=512)
-    def _fetch_success_metrics(self, success_count: int) -> SuccessMetrics:
-        try:
-            level, normalized_value, bias = get_success_rate(success_count)
-        except (ValueError, TypeError):
-            level, normalized_value, bias = "Unknown", 0.5, 0.0
-
-        success_rate = round(normalized_value, 3)
-        consistency = round(min(1.0, normalized_value + bias), 3)
-        return SuccessMetrics(level, success_rate, consistency, bias)
-
-    @lru_cache(maxsize=512)
-    def _fetch_fail_metrics(self, fail_count: int) -> FailMetrics:
-        try:
-            fail_level, fail_value, fail_penalty = get_fail_rate(fail_count)
-        except (ValueError, TypeError):
-            fail_level, fail_value, fail_penalty = "Unknown", 0.0, 0.0
-
-        normalized_fail = round(min(1.0, fail_value + fail_penalty), 3)
-        return FailMetrics(fail_level, fail_value, fail_penalty, normalized_fail)
+        # Guards the previous-beta/momentum read-modify-write so one instance can
+        # be shared across request threads. adjust_difficulty_stateless needs no lock.
+        self._state_lock = threading.Lock()
 
     @staticmethod
-    def _sanitize_beta(beta_old: float) -> float:
-        return clamp_beta(beta_old)
+    def _fetch_success_metrics(success_count: int) -> SuccessMetrics:
+        return _SUCCESS_TABLE[_count_index(success_count, MAX_ATTEMPTS)]
 
     @staticmethod
-    def _sanitize_counts(success_count: int, fail_count: int) -> tuple[int, int]:
-        return max(0, success_count), max(0, fail_count)
+    def _fetch_fail_metrics(fail_count: int) -> FailMetrics:
+        return _FAIL_TABLE[_count_index(fail_count, MAX_FAILS)]
 
     @staticmethod
-    def _extract_irt_snapshot(irt_output: dict) -> IRTSnapshot:
+    def _extract_irt_snapshot(irt_output: dict) -> tuple[float, float]:
         if not isinstance(irt_output, dict):
             raise TypeError("irt_output must be a dictionary")
-        probability = float(irt_output.get("probability", 0.5))
-        theta = float(irt_output.get("adjusted_theta", 0.0))
-        return IRTSnapshot(probability=probability, theta=theta)
-
-
-    @staticmethod
-    def _calculate_behavior_weight(
-        success_metrics: SuccessMetrics, fail_metrics: FailMetrics
-    ) -> float:
         return (
-            (0.6 * success_metrics.success_rate)
-            + (0.4 * success_metrics.consistency)
-            - (0.5 * fail_metrics.penalty)
+            float(irt_output.get("probability", 0.5)),
+            float(irt_output.get("adjusted_theta", 0.0)),
         )
 
-    @staticmethod
-    def _calculate_sensitivity(theta: float) -> float:
-        clamped_theta = max(-3.0, min(3.0, theta))
-        return 1 - (clamped_theta / 6.0)
 
     @staticmethod
-    def _apply_behavior_weight(beta_adjustment: float, behavior_weight: float) -> float:
-        return beta_adjustment * (1 + behavior_weight * 0.3)
-
-    def _enforce_stability_gate(
-        self, performance_gap: float, beta_adjustment: float
-    ) -> float:
-        if abs(performance_gap) < self._stability_threshold:
-            return 0.0
-        return beta_adjustment
-
-    def _apply_momentum(self, beta_adjustment: float) -> float:
-        self._momentum = (
-            self._momentum_factor * self._momentum
-            + (1 - self._momentum_factor) * beta_adjustment
-        )
-        return beta_adjustment + self._momentum * 0.5
-
-    def _slow_if_recently_stable(
-        self, beta_old: float, beta_adjustment: float
+    def _calculate_behavior_weight(
+        success_rate: float, consistency: float, fail_penalty: float
     ) -> float:
-        if self._previous_beta is None:
-            return beta_adjustment
-        delta = abs(beta_old - self._previous_beta)
-        if delta < self._stability_threshold:
-            return beta_adjustment * 0.4
-        return beta_adjustment
-
-    @staticmethod
-    def _propose_beta(beta_old: float, beta_adjustment: float) -> float:
-        proposed = beta_old + math.tanh(beta_adjustment) * 0.8
-        return clamp_beta(proposed)
-
-    @staticmethod
-    def _cap_step(beta_old: float, proposed: float) -> float:
-        if abs(proposed - beta_old) > MAX_BETA_STEP:
-            direction = 1 if proposed > beta_old else -1
-            return clamp_beta(beta_old + direction * MAX_BETA_STEP)
-        return clamp_beta(proposed)
+        return (0.6 * success_rate) + (0.4 * consistency) - (0.5 * fail_penalty)
 
     @staticmethod
     def _preserve_on_perfect_performance(
-        beta_old: float, beta_new: float, irt_snapshot: IRTSnapshot
+        beta_old: float, beta_new: float, probability: float
     ) -> float:
-        if irt_snapshot.probability >= 0.99 and beta_new < beta_old and beta_old >= 0.5:
+        if probability >= 0.99 and beta_new < beta_old and beta_old >= 0.5:
             return beta_old
         return beta_new
 
+    @staticmethod
     def _log_adjustment(
-        self,
         beta_old: float,
         beta_new: float,
         target_performance: float,
@@ -174,55 +214,60 @@ class DDASystem:
         behavior_weight: float,
         success_metrics: SuccessMetrics,
         fail_metrics: FailMetrics,
-        irt_snapshot: IRTSnapshot,
+        probability: float,
+        momentum: float,
+        stability_threshold: float,
     ) -> None:
-        final_adjustment = beta_new - beta_old
-        try:
-            logger.info(
-                {
-                    "event": "dda_adjust",
-                    "beta_old": round(beta_old, 3),
-                    "beta_new": round(beta_new, 3),
-                    "target_performance": round(target_performance, 3),
-                    "actual_performance": round(irt_snapshot.probability, 3),
-                    "performance_gap": round(
-                        target_performance - irt_snapshot.probability, 3
-                    ),
-                    "adjustment_rate": round(adjustment_rate, 3),
-                    "stability_threshold": self._stability_threshold,
-                    "momentum": round(self._momentum, 3),
-                    "behavior_weight": round(behavior_weight, 3),
-                    "success_rate": success_metrics.success_rate,
-                    "consistency": success_metrics.consistency,
-                    "fail_rate": fail_metrics.fail_rate,
-                    "fail_penalty": fail_metrics.penalty,
-                    "final_adjustment": round(final_adjustment, 3),
-                }
-            )
-        except Exception:
-            pass
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        logger.info(
+            "dda_adjust beta_old=%.3f beta_new=%.3f target_performance=%.3f "
+            "actual_performance=%.3f performance_gap=%.3f adjustment_rate=%.3f "
+            "stability_threshold=%s momentum=%.3f behavior_weight=%.3f "
+            "success_rate=%s consistency=%s fail_rate=%s fail_penalty=%s "
+            "final_adjustment=%.3f",
+            beta_old,
+            beta_new,
+            target_performance,
+            probability,
+            target_performance - probability,
+            adjustment_rate,
+            stability_threshold,
+            momentum,
+            behavior_weight,
+            success_metrics.success_rate,
+            success_metrics.consistency,
+            fail_metrics.fail_rate,
+            fail_metrics.penalty,
+            beta_new - beta_old,
+        )
 
+    @staticmethod
     def _build_response(
-        self,
         beta_old: float,
         beta_new: float,
         target_performance: float,
         behavior_weight: float,
         success_metrics: SuccessMetrics,
         fail_metrics: FailMetrics,
-        irt_snapshot: IRTSnapshot,
+        probability: float,
+        theta: float,
+        momentum: float,
+        stability_threshold: float,
     ) -> dict:
         final_adjustment = beta_new - beta_old
         difficulty_label = difficulty_from_beta(beta_new)
+        # Only the six computed floats are rounded here; the metric fields come
+        # pre-rounded from _SUCCESS_TABLE/_FAIL_TABLE and pass through as-is.
         return {
             "beta_new": round(beta_new, 3),
             "difficulty_label": difficulty_label,
-            "actual_performance": round(irt_snapshot.probability, 3),
+            "actual_performance": round(probability, 3),
             "target_performance": target_performance,
             "adjustment_applied": round(final_adjustment, 3),
-            "momentum": round(self._momentum, 3),
+            "momentum": round(momentum, 3),
             "behavior_weight": round(behavior_weight, 3),
-            "irt_theta": round(irt_snapshot.theta, 3),
+            "irt_theta": round(theta, 3),
             "success_rate": success_metrics.success_rate,
             "consistency": success_metrics.consistency,
             "fail_rate": fail_metrics.fail_rate,
@@ -230,7 +275,7 @@ class DDASystem:
             "success_level": success_metrics.level,
             "fail_level": fail_metrics.level,
             "bias": success_metrics.bias,
-            "stability_threshold": self._stability_threshold,
+            "stability_threshold": stability_threshold,
         }
 
     def adjust_difficulty(
@@ -243,33 +288,131 @@ class DDASystem:
         adjustment_rate: float = 0.1,
     ) -> dict:
         """Adjust beta using player performance and behavioral signals."""
-        beta_old = self._sanitize_beta(beta_old)
-        success_count, fail_count = self._sanitize_counts(success_count, fail_count)
-        irt_snapshot = self._extract_irt_snapshot(irt_output)
+        probability, theta = self._extract_irt_snapshot(irt_output)
+        return self._adjust_shared(
+            beta_old,
+            probability,
+            theta,
+            success_count,
+            fail_count,
+            target_performance,
+            adjustment_rate,
+        )
+
+    def adjust_difficulty_fast(
+        self,
+        beta_old: float,
+        irt_result: "IRTResult | IRTProbability",
+        success_count: int = 0,
+        fail_count: int = 0,
+        target_performance: float = 0.7,
+        adjustment_rate: float = 0.1,
+    ) -> dict:
+        """Same as adjust_difficulty, reading an IRT record's fields without a dict hop."""
+        return self._adjust_shared(
+            beta_old,
+            irt_result.probability,
+            irt_result.adjusted_theta,
+            success_count,
+            fail_count,
+            target_performance,
+            adjustment_rate,
+        )
+
+    def adjust_difficulty_stateless(
+        self,
+        beta_old: float,
+        irt_output: dict,
+        success_count: int = 0,
+        fail_count: int = 0,
+        target_performance: float = 0.7,
+        adjustment_rate: float = 0.1,
+        state: DDAState | None = None,
+    ) -> tuple[dict, DDAState]:
+        """
+        Reentrant adjust_difficulty: momentum/history come from ``state`` and
+        the updated state is returned instead of being stored on the instance.
+        """
+        previous_beta, momentum = _INITIAL_STATE if state is None else state
+        probability, theta = self._extract_irt_snapshot(irt_output)
+        response, beta_new, momentum = self._adjust(
+            beta_old,
+            probability,
+            theta,
+            success_count,
+            fail_count,
+            target_performance,
+            adjustment_rate,
+            previous_beta,
+            momentum,
+        )
+        return response, DDAState(beta_new, momentum)
+
+    def _adjust_shared(
+        self,
+        beta_old: float,
+        probability: float,
+        theta: float,
+        success_count: int,
+        fail_count: int,
+        target_performance: float,
+        adjustment_rate: float,
+    ) -> dict:
+        with self._state_lock:
+            response, self._previous_beta, self._momentum = self._adjust(
+                beta_old,
+                probability,
+                theta,
+                success_count,
+                fail_count,
+                target_performance,
+                adjustment_rate,
+                self._previous_beta,
+                self._momentum,
+            )
+        return response
+
+    def _adjust(
+        self,
+        beta_old: float,
+        probability: float,
+        theta: float,
+        success_count: int,
+        fail_count: int,
+        target_performance: float,
+        adjustment_rate: float,
+        previous_beta: float | None,
+        momentum: float,
+    ) -> tuple[dict, float, float]:
+        stability_threshold = self._stability_threshold
+        beta_old, success_count, fail_count = _sanitize_inputs(
+            beta_old, success_count, fail_count
+        )
 
         success_metrics = self._fetch_success_metrics(success_count)
         fail_metrics = self._fetch_fail_metrics(fail_count)
 
-        performance_gap = target_performance - irt_snapshot.probability
-        sensitivity = self._calculate_sensitivity(irt_snapshot.theta)
-        beta_adjustment = adjustment_rate * performance_gap * sensitivity
-
+        _, success_rate, consistency, _ = success_metrics
+        _, _, fail_penalty, _ = fail_metrics
         behavior_weight = self._calculate_behavior_weight(
-            success_metrics, fail_metrics
+            success_rate, consistency, fail_penalty
+        )
+        beta_new, momentum = _dda_step(
+            beta_old,
+            probability,
+            theta,
+            target_performance,
+            adjustment_rate,
+            behavior_weight,
+            momentum,
+            self._momentum_factor,
+            stability_threshold,
+            previous_beta,
         )
-        beta_adjustment = self._apply_behavior_weight(beta_adjustment, behavior_weight)
-        beta_adjustment = self._enforce_stability_gate(performance_gap, beta_adjustment)
-        beta_adjustment = self._apply_momentum(beta_adjustment)
-        beta_adjustment = self._slow_if_recently_stable(beta_old, beta_adjustment)
-
-        proposed_beta = self._propose_beta(beta_old, beta_adjustment)
-        beta_new = self._cap_step(beta_old, proposed_beta)
         beta_new = self._preserve_on_perfect_performance(
-            beta_old, beta_new, irt_snapshot
+            beta_old, beta_new, probability
         )
 
-        self._previous_beta = beta_new
-
         self._log_adjustment(
             beta_old,
             beta_new,
@@ -278,14 +421,20 @@ class DDASystem:
             behavior_weight,
             success_metrics,
             fail_metrics,
-            irt_snapshot,
+            probability,
+            momentum,
+            stability_threshold,
         )
-        return self._build_response(
+        response = self._build_response(
             beta_old,
             beta_new,
             target_performance,
             behavior_weight,
             success_metrics,
             fail_metrics,
-            irt_snapshot,
+            probability,
+            theta,
+            momentum,
+            stability_threshold,
         )
+        return response, beta_new, momentum
@@ -8,45 +8,165 @@ Key Functions:
 - compute_probability(): Predicts success using theta (ability) and beta (difficulty)
 - update_ability(): Adjusts ability based on success/fail counts
 - compute_full_irt(): Complete IRT computation with bonuses/penalties
+- compute_full_irt_fast(): Same computation returning an IRTResult record (no dict)
+- compute_full_irt_batch(): Same computation over parallel per-player sequences
 - irt_probability(): Lightweight wrapper for matchmaking
+- irt_probability_fast(): Same computation returning an IRTProbability record (no dict)
 
 Concepts: Theta (ability -3.0 to 3.0), Beta (difficulty 0.1 to 1.0), 
           Adjusted Theta (with bonuses), Confidence Index (consistency)
 """
 
+import atexit
 import math
 import json
 import os
+import queue
+import threading
+from functools import lru_cache
+from typing import NamedTuple
 from IRT_Bases.Rank import get_rank_data, get_rank_from_exp
 from IRT_Bases.Achivements import get_achievement_score
 from IRT_Bases.Success import get_success_rate
 from IRT_Bases.Fail import get_fail_rate
 from RankBases.EXP import PlayerEXP
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_tanh = math.tanh
+
+
+# Serialize one log record to a newline-terminated UTF-8 line.
+# orjson is used when installed; the stdlib fallback emits the same compact form.
+if orjson is not None:
+    def _dumps_line(data: dict) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_APPEND_NEWLINE)
+else:
+    def _dumps_line(data: dict) -> bytes:
+        return (json.dumps(data, separators=(',', ':')) + "\n").encode()
+
+
+# Background log writer: log_results enqueues serialized lines and returns
+# immediately; a daemon thread drains them in batches and appends each batch
+# with one write per file through long-lived buffered handles.
+_LOG_QUEUE = queue.Queue(maxsize=65536)
+_LOG_BATCH_SIZE = 256
+_log_writer = None
+_log_writer_lock = threading.Lock()
+
+
+def _log_writer_loop():
+    handles = {}
+    while True:
+        batch = [_LOG_QUEUE.get()]
+        while len(batch) < _LOG_BATCH_SIZE:
+            try:
+                batch.append(_LOG_QUEUE.get_nowait())
+            except queue.Empty:
+                break
+
+        lines_by_file = {}
+        for path, line in batch:
+            lines_by_file.setdefault(path, []).append(line)
+        for path, lines in lines_by_file.items():
+            try:
+                f = handles.get(path)
+                if f is None:
+                    f = handles[path] = open(path, "ab", buffering=1 << 20)
+                f.write(b"".join(lines))
+                f.flush()
+            except (IOError, OSError):
+                handles.pop(path, None)
+
+        for _ in batch:
+            _LOG_QUEUE.task_done()
+
+
+def _ensure_log_writer():
+    global _log_writer
+    if _log_writer is not None:
+        return
+    with _log_writer_lock:
+        if _log_writer is None:
+            _log_writer = threading.Thread(target=_log_writer_loop, name="irt-log-writer", daemon=True)
+            _log_writer.start()
+
+
+# Drain pending lines before the interpreter exits (scripts are short-lived child processes).
+@atexit.register
+def _flush_log_queue():
+    if _log_writer is not None and _log_writer.is_alive():
+        _LOG_QUEUE.join()
+
+
+# Learning-decay multipliers (1 - decay_rate * sessions) for sessions 0..MAX_DECAY_SESSIONS.
+# Built once per distinct decay_rate and shared by every IRTModel using it.
+MAX_DECAY_SESSIONS = 1000
+
+
+@lru_cache(maxsize=8)
+def _decay_multipliers(decay_rate: float) -> tuple:
+    return tuple(1 - (decay_rate * s) for s in range(MAX_DECAY_SESSIONS + 1))
+
+
+# IRT Result Record: Field names match the compute_full_irt dict keys
+class IRTResult(NamedTuple):
+    user_id: str
+    rank: str
+    success_level: str
+    fail_level: str
+    probability: float
+    adjusted_theta: float
+    confidence_index: float
+    success_rate: float
+    fail_rate_value: float
+    rank_bonus: float
+    achievement_score: int
+    fail_penalty: float
+    sessions_played: int
+
+
+# IRT Probability Record: Field names match the irt_probability dict keys
+class IRTProbability(NamedTuple):
+    probability: float
+    adjusted_theta: float
+    confidence_index: float
+    success_rate: float
+    fail_rate: float
+    rank_bonus: float
+    achievement_score: float
+
 
 # IRT Model Class - Encapsulates all IRT computations
 class IRTModel:
-    __slots__ = ("D", "decay_rate", "alpha", "log_file")
+    __slots__ = ("D", "decay_rate", "alpha", "log_file", "_logging_enabled", "_decay_mul")
     
     # D: Scaling factor (1.7), decay_rate: Ability decay after inactivity
-    # alpha: Smoothing factor, log_file: Logging path
+    # alpha: Smoothing factor, log_file: Logging path (None disables result logging)
     def __init__(self, D: float = 1.7, decay_rate: float = 0.01, alpha: float = 0.3, log_file: str = "IRT_Logs.json"):
         self.D = D
         self.decay_rate = decay_rate
+        self._decay_mul = _decay_multipliers(decay_rate)
         self.alpha = alpha
         self.log_file = log_file
+        self._logging_enabled = bool(log_file)
 
     # Core Utilities: Mathematical helpers for IRT computations
     
     # Sigmoid: Converts (theta - beta) to probability [0, 1] using tanh
-    # Returns 0.0 for x < -20, 1.0 for x > 20 (prevents overflow)
+    # Returns 0.0 for x < -20, 1.0 for x > 20 (exact saturation at the tails)
+    # libm tanh is a single C call; polynomial stand-ins and lookup tables cost as much
+    # bytecode as they save, and a nearest-entry table shifts the 4-decimal probability
     @staticmethod
     def _sigmoid(x: float) -> float:
         if x < -20:
             return 0.0
         if x > 20:
             return 1.0
-        return 0.5 * (1.0 + math.tanh(x / 2.0))
+        return 0.5 + 0.5 * _tanh(0.5 * x)
 
     # Clamp: Keeps theta in valid range [-3.0, 3.0]
     @staticmethod
@@ -62,19 +182,31 @@ class IRTModel:
         return round(max(0.0, min(confidence, 1.0)), 3)
 
     # Learning Decay: Reduces ability after inactivity (prevents stale data)
+    # Multiplier comes from the per-decay_rate table for int sessions; anything else
+    # (floats, sessions beyond the table) uses the formula
     def apply_learning_decay(self, theta: float, sessions_played: int) -> float:
-        decayed_theta = theta * (1 - (self.decay_rate * sessions_played))
+        if isinstance(sessions_played, int) and 0 <= sessions_played <= MAX_DECAY_SESSIONS:
+            decayed_theta = theta * self._decay_mul[sessions_played]
+        else:
+            decayed_theta = theta * (1 - (self.decay_rate * sessions_played))
         return round(self._clamp(decayed_theta), 3)
 
     # Smooth Value: Exponential moving average to prevent sudden ability jumps
     def smooth_value(self, current: float, previous: float) -> float:
         return round(self.alpha * current + (1 - self.alpha) * previous, 3)
 
+    # Log Results: Queues one JSON line for the background writer (drops when the queue is full)
     def log_results(self, data: dict):
+        if not self._logging_enabled:
+            return
+        try:
+            line = _dumps_line(data)
+        except (TypeError, ValueError):
+            return
+        _ensure_log_writer()
         try:
-            with open(self.log_file, "a", buffering=8192) as f:
-                f.write(json.dumps(data, separators=(',', ':')) + "\n")
-        except (IOError, OSError, TypeError) as e:
+            _LOG_QUEUE.put_nowait((self.log_file, line))
+        except queue.Full:
             pass
 
     # Core Computation: Fundamental IRT calculations
@@ -95,9 +227,7 @@ class IRTModel:
         delta = (performance_ratio - 0.5) * learning_rate
         return self._clamp(theta + delta)
 
-    # Full IRT Computation: Combines all components
-    # Steps: 1) Base probability 2) Ability adjustment 3) Rank/achievement bonuses
-    #        4) Success/fail penalties 5) Confidence weighting 6) Learning decay 7) Smoothing
+    # Full IRT Computation: Dict view of compute_full_irt_fast (backward compatible API)
     def compute_full_irt(
         self,
         user_id: str = None,
@@ -110,6 +240,26 @@ class IRTModel:
         player_exp: PlayerEXP = None,
         exp: int = None
     ):
+        return self.compute_full_irt_fast(
+            user_id, theta, beta, success_count, fail_count,
+            sessions_played, prev_theta, player_exp, exp
+        )._asdict()
+
+    # Fast Full IRT Computation: Combines all components, returns an IRTResult record
+    # Steps: 1) Base probability 2) Ability adjustment 3) Rank/achievement bonuses
+    #        4) Success/fail penalties 5) Confidence weighting 6) Learning decay 7) Smoothing
+    def compute_full_irt_fast(
+        self,
+        user_id: str = None,
+        theta: float = 0.0,
+        beta: float = 0.5,
+        success_count: int = 0,
+        fail_count: int = 0,
+        sessions_played: int = 1,
+        prev_theta: float = None,
+        player_exp: PlayerEXP = None,
+        exp: int = None
+    ) -> "IRTResult":
         # Handle missing user_id (for new users)
         if user_id is None:
             user_id = "default_user"
@@ -161,39 +311,72 @@ class IRTModel:
             adjusted_theta = self.smooth_value(adjusted_theta, prev_theta)
             adjusted_theta = self._clamp(adjusted_theta)
 
-        # Build result payload consumed by downstream DDA logic.
-        result = {
-            "user_id": user_id,
-            "rank": rank_name,
-            "success_level": success_level,
-            "fail_level": fail_level,
-            "probability": probability,
-            "adjusted_theta": adjusted_theta,
-            "confidence_index": confidence,
-            "success_rate": round(success_rate, 3),
-            "fail_rate_value": round(fail_value, 3),
-            "rank_bonus": rank_bonus,
-            "achievement_score": achievement_score,
-            "fail_penalty": fail_penalty,
-            "sessions_played": sessions_played,
-        }
-
-        return result
+        # Build result record consumed by downstream DDA logic.
+        return IRTResult(
+            user_id,
+            rank_name,
+            success_level,
+            fail_level,
+            probability,
+            adjusted_theta,
+            confidence,
+            round(success_rate, 3),
+            round(fail_value, 3),
+            rank_bonus,
+            achievement_score,
+            fail_penalty,
+            sessions_played,
+        )
 
-# ----------------------------------------------------------------------
-# Compatibility wrapper: lightweight API used elsewhere (battle scripts).
-# ----------------------------------------------------------------------
-def irt_probability(
-    theta: float = 0.0,
-    beta: float = 0.5,
-    rank_name: str = "novice",
-    completed_achievements: int = 0,
-    success_count: int = 0,
-    fail_count: int = 0,
-    exp: int = None
-) -> dict:
-    model = IRTModel()
-    
+    # Batch IRT Computation: compute_full_irt over parallel per-player sequences
+    # Optional sequences may be None (every player then uses the scalar default)
+    def compute_full_irt_batch(
+        self,
+        thetas,
+        betas,
+        success_counts,
+        fail_counts,
+        sessions_played=None,
+        prev_thetas=None,
+        exps=None,
+        user_ids=None
+    ) -> list:
+        n = len(thetas)
+        if not (len(betas) == len(success_counts) == len(fail_counts) == n):
+            raise ValueError("thetas, betas, success_counts and fail_counts must have equal length")
+        for name, seq in (("sessions_played", sessions_played), ("prev_thetas", prev_thetas),
+                          ("exps", exps), ("user_ids", user_ids)):
+            if seq is not None and len(seq) != n:
+                raise ValueError(f"{name} must have the same length as thetas")
+
+        compute = self.compute_full_irt_fast
+        results = [None] * n
+        for i in range(n):
+            results[i] = compute(
+                user_ids[i] if user_ids is not None else None,
+                thetas[i],
+                betas[i],
+                success_counts[i],
+                fail_counts[i],
+                sessions_played[i] if sessions_played is not None else 1,
+                prev_thetas[i] if prev_thetas is not None else None,
+                None,
+                exps[i] if exps is not None else None,
+            )._asdict()
+        return results
+
+
+# IRT Profile: clamps, bonuses and probability shared by irt_probability and batch_irt_probability
+# Returns (probability, adjusted_theta, success_rate, fail_rate, achievement_score)
+def _irt_profile(
+    model: IRTModel,
+    theta: float,
+    beta: float,
+    completed_achievements: int,
+    success_count: int,
+    fail_count: int,
+    rank_bonus: float
+) -> tuple:
     # Input validation
     theta = model._clamp(theta)
     beta = max(0.1, min(1.0, beta))
@@ -203,12 +386,6 @@ def irt_probability(
         fail_count = 0
     if completed_achievements < 0:
         completed_achievements = 0
-    
-    # Get rank and achievement bonuses - use EXP if available
-    if exp is not None:
-        _, rank_bonus = get_rank_from_exp(exp)
-    else:
-        _, rank_bonus = get_rank_data("user")
     achievement_score = completed_achievements * 0.01
     
     # Get success/fail rates
@@ -216,31 +393,100 @@ def irt_probability(
     _, fail_value, fail_penalty = get_fail_rate(fail_count)
     
     # Compute base probability (with D scaling factor)
-    prob_input = model.D * (theta - beta)
-    probability = model._sigmoid(prob_input)
+    probability = model._sigmoid(model.D * (theta - beta))
     
     # Adjust theta with bonuses
     adjusted_theta = model.update_ability(theta, success_count, fail_count)
     adjusted_theta += rank_bonus + success_bonus - fail_penalty
     adjusted_theta += min(achievement_score * 0.01, 0.1)
-    adjusted_theta = model._clamp(adjusted_theta)
+    return probability, model._clamp(adjusted_theta), success_rate, fail_value, achievement_score
+
+
+# ----------------------------------------------------------------------
+# Compatibility wrapper: lightweight API used elsewhere (battle scripts).
+# ----------------------------------------------------------------------
+def irt_probability(
+    theta: float = 0.0,
+    beta: float = 0.5,
+    rank_name: str = "novice",
+    completed_achievements: int = 0,
+    success_count: int = 0,
+    fail_count: int = 0,
+    exp: int = None
+) -> dict:
+    return irt_probability_fast(
+        theta, beta, rank_name, completed_achievements, success_count, fail_count, exp
+    )._asdict()
+
+
+# Fast form of irt_probability: returns an IRTProbability record (dicts are built only at API boundaries)
+def irt_probability_fast(
+    theta: float = 0.0,
+    beta: float = 0.5,
+    rank_name: str = "novice",
+    completed_achievements: int = 0,
+    success_count: int = 0,
+    fail_count: int = 0,
+    exp: int = None
+) -> IRTProbability:
+    model = IRTModel()
+    
+    # Get rank bonus - use EXP if available
+    if exp is not None:
+        _, rank_bonus = get_rank_from_exp(exp)
+    else:
+        _, rank_bonus = get_rank_data("user")
+    probability, adjusted_theta, success_rate, fail_value, achievement_score = _irt_profile(
+        model, theta, beta, completed_achievements, success_count, fail_count, rank_bonus
+    )
     
     # Compute confidence index (performance consistency)
     confidence = model.compute_confidence(success_rate, fail_value)
     
-    return {
-        "probability": probability,
-        "adjusted_theta": adjusted_theta,
-        "confidence_index": confidence,
-        "success_rate": success_rate,
-        "fail_rate": fail_value,
-        "rank_bonus": rank_bonus,
-        "achievement_score": achievement_score
+    return IRTProbability(
+        probability,
+        adjusted_theta,
+        confidence,
+        success_rate,
+        fail_value,
+        rank_bonus,
+        achievement_score,
+    )
 
 
+# Batch form of irt_probability: same _irt_profile math, one model and one pass for all players
+# Returns only the two fields matchmaking consumes (adjusted_theta, probability)
+def batch_irt_probability(
+    thetas,
+    betas,
+    completed_achievements,
+    success_counts,
+    fail_counts,
+    exps=None
+) -> tuple[list, list]:
+    n = len(thetas)
+    if not (len(betas) == len(completed_achievements) == len(success_counts) == len(fail_counts) == n):
+        raise ValueError("thetas, betas, completed_achievements, success_counts and fail_counts must have equal length")
+    if exps is not None and len(exps) != n:
+        raise ValueError("exps must have the same length as thetas")
 
-        
-    }
+    model = IRTModel(log_file=None)
+    _, default_rank_bonus = get_rank_data("user")
+
+    adjusted_thetas = [None] * n
+    probabilities = [None] * n
+    for i in range(n):
+        exp = exps[i] if exps is not None else None
+        if exp is not None:
+            _, rank_bonus = get_rank_from_exp(exp)
+        else:
+            rank_bonus = default_rank_bonus
+        probabilities[i], adjusted_thetas[i], _, _, _ = _irt_profile(
+            model, thetas[i], betas[i], completed_achievements[i],
+            success_counts[i], fail_counts[i], rank_bonus
+        )
+
+    return adjusted_thetas, probabilities
 
 
     
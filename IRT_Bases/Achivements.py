@@ -1,5 +1,4 @@
 
-from functools import lru_cache
 TOTAL_ACHIEVEMENTS = 30
 
 BIAS_THRESHOLDS = (
@@ -18,26 +17,33 @@ for i in range(TOTAL_ACHIEVEMENTS + 1):
         if progress < threshold:
             _BIAS_MAP[i] = bias
             break
+_BIAS_MAP = tuple(_BIAS_MAP)
+_PROGRESS_MAP = tuple(i / TOTAL_ACHIEVEMENTS for i in range(TOTAL_ACHIEVEMENTS + 1))
 
+# Display-rounded copies for get_status (percent to 2 dp, bias to 4 dp)
+_STATUS_PROGRESS = tuple(round(p * 100, 2) for p in _PROGRESS_MAP)
+_STATUS_BIAS = tuple(round(b, 4) for b in _BIAS_MAP)
 
-@lru_cache(maxsize=TOTAL_ACHIEVEMENTS + 1)
-def get_achievement_value(completed: int) -> tuple[float, float]:
-    """
-    Fast retrieval of achievement progress and bias.
-    Uses precomputed bias table and cached lookups.
-    """
+
+def _clamp_index(completed: int) -> int:
+    """Validate a completed count and clamp it to a table row in [0, TOTAL_ACHIEVEMENTS]."""
     if not isinstance(completed, int):
         raise TypeError(f"Expected int for 'completed', got {type(completed).__name__}")
 
-    # Clamp and lookup precomputed bias
     if completed < 0:
-        completed = 0
-    elif completed > TOTAL_ACHIEVEMENTS:
-        completed = TOTAL_ACHIEVEMENTS
+        return 0
+    if completed > TOTAL_ACHIEVEMENTS:
+        return TOTAL_ACHIEVEMENTS
+    return completed
 
-    progress = completed / TOTAL_ACHIEVEMENTS
-    bias = _BIAS_MAP[completed]
-    return progress, bias
+
+def get_achievement_value(completed: int) -> tuple[float, float]:
+    """
+    Fast retrieval of achievement progress and bias.
+    Both values come straight from the precomputed tables.
+    """
+    idx = _clamp_index(completed)
+    return _PROGRESS_MAP[idx], _BIAS_MAP[idx]
 
 
 
@@ -68,12 +74,13 @@ class PlayerAchievement:
 
     def get_status(self) -> dict:
         """Returns fast cached status lookup."""
-        progress, bias = get_achievement_value(self.completed)
+        completed = self.completed
+        idx = _clamp_index(completed)
         return {
             "player": self.player_name,
-            "completed": self.completed,
-            "progress": round(progress * 100, 2),
-            "bias": round(bias, 4)
+            "completed": completed,
+            "progress": _STATUS_PROGRESS[idx],
+            "bias": _STATUS_BIAS[idx]
         }
 
 
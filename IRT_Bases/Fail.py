@@ -14,6 +14,16 @@ FAIL_TIERS = [
 
 DEFAULT_FAIL = {"level": "Minimal Failure", "value": 0.10, "penalty": 0.00}
 
+# Tier lookup by fail_equiv (0..MAX_FAILS): _TIER_IDX maps each value to a row
+# of the parallel _TIER_LEVEL / _TIER_PENALTY_BASE tuples; the last row is DEFAULT_FAIL.
+_TIERS = (*FAIL_TIERS, DEFAULT_FAIL)
+_TIER_LEVEL = tuple(t["level"] for t in _TIERS)
+_TIER_PENALTY_BASE = tuple(t["penalty"] for t in _TIERS)
+_TIER_IDX = tuple(
+    next((k for k, t in enumerate(FAIL_TIERS) if t["min"] <= i <= t["max"]), len(FAIL_TIERS))
+    for i in range(MAX_FAILS + 1)
+)
+
 
 # Weighted Failure Computation
 @lru_cache(maxsize=None)
@@ -69,17 +79,16 @@ def compute_failure(
     weighted_failure = max(0.0, min(weighted_failure, 1.0))
 
     #Tier Classification
-    fail_equiv = int(weighted_failure * MAX_FAILS)
-    tier = next((t for t in FAIL_TIERS if t["min"] <= fail_equiv <= t["max"]), DEFAULT_FAIL)
+    tier = _TIER_IDX[int(weighted_failure * MAX_FAILS)]
 
     # Dynamic Penalty Adjustment
-    dynamic_penalty = tier["penalty"] + (sqrt(weighted_failure) * 0.02)
+    dynamic_penalty = _TIER_PENALTY_BASE[tier] + (sqrt(weighted_failure) * 0.02)
 
     #Adaptive Normalization (inverted sigmoid to model failure)
     normalized = 1 - (1 / (1 + exp(-6 * (weighted_failure - 0.5))))
 
     return {
-        "level": tier["level"],
+        "level": _TIER_LEVEL[tier],
         "fail_value": round(weighted_failure, 4),
         "penalty": round(dynamic_penalty, 4),
         "normalized": round(normalized, 4),
@@ -93,7 +102,23 @@ def compute_failure(
     }
 
 
-@lru_cache(maxsize=MAX_FAILS + 1)
+# Precomputed (level, fail_value, penalty) for every fail count in [0, MAX_FAILS].
+# Counts above MAX_FAILS saturate, so the table covers the whole input domain.
+def _build_fail_table() -> tuple[tuple[str, ...], tuple[float, ...], tuple[float, ...]]:
+    levels, values, penalties = [], [], []
+    for fail_count in range(MAX_FAILS + 1):
+        normalized = fail_count / MAX_FAILS
+        tier = _TIER_IDX[int(normalized * MAX_FAILS)]
+        dynamic_penalty = _TIER_PENALTY_BASE[tier] + (sqrt(normalized) * 0.02)
+        levels.append(_TIER_LEVEL[tier])
+        values.append(round(normalized, 4))
+        penalties.append(round(dynamic_penalty, 4))
+    return tuple(levels), tuple(values), tuple(penalties)
+
+
+_FAIL_LEVEL, _FAIL_VALUE, _FAIL_PENALTY = _build_fail_table()
+
+
 def get_fail_rate(fail_count: int) -> tuple[str, float, float]:
     """
     Fast wrapper function for failure rate calculation.
@@ -106,16 +131,7 @@ def get_fail_rate(fail_count: int) -> tuple[str, float, float]:
         tuple: (level_name, fail_rate_value, penalty_value)
     """
     if not isinstance(fail_count, int) or fail_count < 0:
-        fail_count = 0
-    
-    # Use simplified calculation for speed (only puzzle fail, assume defaults for others)
-    normalized = min(fail_count / MAX_FAILS, 1.0)
-    fail_equiv = int(normalized * MAX_FAILS)
-    
-    # Find matching tier
-    tier = next((t for t in FAIL_TIERS if t["min"] <= fail_equiv <= t["max"]), DEFAULT_FAIL)
-    
-    # Calculate dynamic penalty
-    dynamic_penalty = tier["penalty"] + (sqrt(normalized) * 0.02)
-    
-    return tier["level"], round(normalized, 4), round(dynamic_penalty, 4)
\ No newline at end of file
+        i = 0
+    else:
+        i = fail_count if fail_count < MAX_FAILS else MAX_FAILS
+    return _FAIL_LEVEL[i], _FAIL_VALUE[i], _FAIL_PENALTY[i]
@@ -1,7 +1,7 @@
-
+from bisect import bisect_right
 from functools import lru_cache
-from threading import Lock
-from RankBases.EXP import get_normalized_exp, PlayerEXP
+from typing import NamedTuple
+from RankBases.EXP import MAX_EXP, get_normalized_exp, PlayerEXP
 
 
 # Configuration
@@ -46,36 +46,95 @@ RANK_BIAS = (
 #  Direct index and reverse lookup maps
 _RANK_INDEX = {name: i for i, name in enumerate(RANK_LEVELS)}
 _RANK_FROM_INDEX = tuple(RANK_LEVELS)
+_RANK_VALUE = tuple(zip(RANK_THRESHOLDS, RANK_BIAS))
+
+#  Common spellings ("bronze_coder", "Bronze Coder", "bronze coder") resolve without normalizing
+_RANK_LOOKUP = dict(_RANK_INDEX)
+for _name, _idx in _RANK_INDEX.items():
+    _RANK_LOOKUP[_name.replace("_", " ")] = _idx
+    _RANK_LOOKUP[_name.replace("_", " ").title()] = _idx
+
+#  Display-rounded threshold/bias per rank index for get_status
+_STATUS_VALUE = tuple(round(v, 4) for v in RANK_THRESHOLDS)
+_STATUS_BIAS = tuple(round(b, 4) for b in RANK_BIAS)
+
 
-#  Thread lock for rank updates 
-_rank_lock = Lock()
+class RankStatus(NamedTuple):
+    player: str
+    rank: str
+    rank_index: int
+    rank_value: float
+    bias: float
+    locked: bool
+
+#  No module-wide lock: each update below is a single STORE_ATTR of an int,
+#  which is atomic under the GIL and never serializes unrelated players.
 
 
 
 # Rank Retrieval
-@lru_cache(maxsize=None)
+def _rank_index_for(value: float) -> int:
+    """Index of the highest threshold <= value (thresholds are sorted ascending)."""
+    # A single compare covers negatives and NaN, which map to the lowest rank
+    if not value >= 0.0:
+        return 0
+    return bisect_right(RANK_THRESHOLDS, value) - 1
+
+
+# Exact uint8 rank index for every integer EXP in [0, MAX_EXP] (one byte per entry)
+_RANK_BY_EXP = bytes(_rank_index_for(get_normalized_exp(e)) for e in range(MAX_EXP + 1))
+
+
+def _rank_index_from_exp(exp: int) -> int:
+    """Clamp raw EXP to [0, MAX_EXP] and read its rank index from the table."""
+    if not isinstance(exp, int):
+        raise TypeError("exp must be an integer.")
+    return _RANK_BY_EXP[0 if exp < 0 else (MAX_EXP if exp > MAX_EXP else exp)]
+
+
+@lru_cache(maxsize=256)
+def _rank_index_for_name(rank_name: str) -> int:
+    """Normalize an uncommon rank spelling and cache its index."""
+    key = rank_name.strip().lower().replace(" ", "_")
+    return _RANK_INDEX.get(key, 0)
+
+
+def _rank_index_from_name(rank_name: str) -> int:
+    idx = _RANK_LOOKUP.get(rank_name)
+    return _rank_index_for_name(rank_name) if idx is None else idx
+
+
 def get_rank_value(rank_name: str) -> tuple[float, float]:
-    """Return normalized rank value and bias (cached O(1))."""
+    """Return normalized rank value and bias (O(1) dict hit for common spellings)."""
     if not isinstance(rank_name, str):
         raise TypeError("rank_name must be a string.")
-    key = rank_name.strip().lower().replace(" ", "_")
-    idx = _RANK_INDEX.get(key, 0)
-    return RANK_THRESHOLDS[idx], RANK_BIAS[idx]
+    return _RANK_VALUE[_rank_index_from_name(rank_name)]
 
 
 def get_rank_name(rank_value: float) -> str:
     """Return rank name from normalized EXP (0.0–1.0) (optimized)."""
     if not isinstance(rank_value, (int, float)):
         raise TypeError("rank_value must be numeric.")
-    # Find the highest rank threshold that the value meets or exceeds
-    # Since thresholds are now non-linear, we need to check each threshold
-    idx = 0
-    for i in range(len(RANK_THRESHOLDS) - 1, -1, -1):
-        if rank_value >= RANK_THRESHOLDS[i]:
-            idx = i
-            break
-    idx = 0 if idx < 0 else (_TOTAL_RANKS if idx > _TOTAL_RANKS else idx)
-    return _RANK_FROM_INDEX[idx]
+    return _RANK_FROM_INDEX[_rank_index_for(rank_value)]
+
+
+def get_rank_names(rank_values) -> list[str]:
+    """Batch form of get_rank_name for a sequence of normalized EXP values."""
+    index_for = _rank_index_for
+    names = _RANK_FROM_INDEX
+    result = []
+    for value in rank_values:
+        if not isinstance(value, (int, float)):
+            raise TypeError("rank_value must be numeric.")
+        result.append(names[index_for(value)])
+    return result
+
+
+def get_rank_names_from_exp(exps) -> list[str]:
+    """Batch rank names for raw EXP values via the per-EXP lookup table."""
+    index_from_exp = _rank_index_from_exp
+    names = _RANK_FROM_INDEX
+    return [names[index_from_exp(exp)] for exp in exps]
 
 
 
@@ -96,24 +155,20 @@ class PlayerRank:
    
     # Rank Management
     def set_rank(self, rank_name: str) -> None:
-        """Sets rank directly by name (thread-safe)."""
-        key = rank_name.strip().lower().replace(" ", "_")
-        with _rank_lock:
-            self._rank_index = _RANK_INDEX.get(key, 0)
+        """Sets rank directly by name (single atomic store)."""
+        self._rank_index = _rank_index_from_name(rank_name)
 
     def promote(self, steps: int = 1) -> None:
-        """Moves player up the rank ladder (thread-safe)."""
+        """Moves player up the rank ladder (single store of the clamped index)."""
         if self._locked:
             return
-        with _rank_lock:
-            self._rank_index = min(self._rank_index + steps, _TOTAL_RANKS)
+        self._rank_index = min(self._rank_index + steps, _TOTAL_RANKS)
 
     def demote(self, steps: int = 1) -> None:
-        """Moves player down the rank ladder (thread-safe)."""
+        """Moves player down the rank ladder (single store of the clamped index)."""
         if self._locked:
             return
-        with _rank_lock:
-            self._rank_index = max(self._rank_index - steps, 0)
+        self._rank_index = max(self._rank_index - steps, 0)
 
     def lock_rank(self, state: bool = True) -> None:
         """Prevents frequent rank changes."""
@@ -129,14 +184,7 @@ class PlayerRank:
         """
         if not isinstance(normalized_exp, (int, float)):
             raise TypeError("normalized_exp must be numeric.")
-        with _rank_lock:
-            # Find the highest rank threshold that the value meets or exceeds
-            idx = 0
-            for i in range(len(RANK_THRESHOLDS) - 1, -1, -1):
-                if normalized_exp >= RANK_THRESHOLDS[i]:
-                    idx = i
-                    break
-            self._rank_index = max(0, min(idx, _TOTAL_RANKS))
+        self._rank_index = _rank_index_for(normalized_exp)
 
     def update_from_player_exp(self, player_exp: PlayerEXP) -> None:
         """
@@ -148,30 +196,111 @@ class PlayerRank:
         """
         if not isinstance(player_exp, PlayerEXP):
             raise TypeError("player_exp must be a PlayerEXP instance.")
-        normalized_exp = get_normalized_exp(player_exp.exp)
-        self.update_from_exp(normalized_exp)
+        # Raw EXP goes straight to the per-EXP table; no re-validation of the ratio
+        self._rank_index = _rank_index_from_exp(player_exp.exp)
 
 
     # Rank Information
 
-    def get_status(self) -> dict:
-        """Return rank data with bias and EXP ratio."""
-        rank_name = _RANK_FROM_INDEX[self._rank_index]
-        rank_value, bias = get_rank_value(rank_name)
-        return {
-            "player": self.player_name,
-            "rank": rank_name,
-            "rank_index": self._rank_index,
-            "rank_value": round(rank_value, 4),
-            "bias": round(bias, 4),
-            "locked": self._locked
-        }
+    def get_status(self) -> RankStatus:
+        """Return rank data with bias and EXP ratio (use ._asdict() for a dict)."""
+        idx = self._rank_index
+        return RankStatus(
+            self.player_name,
+            _RANK_FROM_INDEX[idx],
+            idx,
+            _STATUS_VALUE[idx],
+            _STATUS_BIAS[idx],
+            self._locked
+        )
 
     def __repr__(self):
         return f"<PlayerRank {self.player_name}: {RANK_LEVELS[self._rank_index].title()}>"
 
 
 
+# RankRegistry (structure-of-arrays rank store for bulk updates)
+class RankRegistry:
+    """
+    Rank tracker for many players at once.
+    Stores names, rank indices and lock flags in parallel arrays (one byte per
+    player for index and lock) so bulk updates are single passes over flat data.
+    Per-player semantics match PlayerRank: locks only block promote/demote.
+    """
+
+    __slots__ = ("names", "rank_index", "locked")
+
+    def __init__(self):
+        self.names = []
+        self.rank_index = bytearray()
+        self.locked = bytearray()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def add(self, player_name: str) -> int:
+        """Registers a player at the lowest rank and returns their slot index."""
+        self.names.append(player_name)
+        self.rank_index.append(0)
+        self.locked.append(0)
+        return len(self.names) - 1
+
+    def lock_rank(self, idx: int, state: bool = True) -> None:
+        self.locked[idx] = 1 if state else 0
+
+    def promote_bulk(self, indices, steps: int = 1) -> None:
+        """Moves every unlocked player in indices up the rank ladder."""
+        ranks = self.rank_index
+        locked = self.locked
+        for i in indices:
+            if not locked[i]:
+                ranks[i] = min(ranks[i] + steps, _TOTAL_RANKS)
+
+    def demote_bulk(self, indices, steps: int = 1) -> None:
+        """Moves every unlocked player in indices down the rank ladder."""
+        ranks = self.rank_index
+        locked = self.locked
+        for i in indices:
+            if not locked[i]:
+                ranks[i] = max(ranks[i] - steps, 0)
+
+    def update_from_exp_bulk(self, exps) -> None:
+        """Sync all ranks from raw EXP values (one per registered player)."""
+        if len(exps) != len(self.names):
+            raise ValueError("exps must have one entry per registered player.")
+        self.rank_index = bytearray(_rank_index_from_exp(exp) for exp in exps)
+
+    def update_from_normalized_bulk(self, normalized_exps) -> None:
+        """Sync all ranks from normalized EXP values (0.0–1.0)."""
+        if len(normalized_exps) != len(self.names):
+            raise ValueError("normalized_exps must have one entry per registered player.")
+        index_for = _rank_index_for
+        result = bytearray()
+        for value in normalized_exps:
+            if not isinstance(value, (int, float)):
+                raise TypeError("normalized_exp must be numeric.")
+            result.append(index_for(value))
+        self.rank_index = result
+
+    def rank_names(self) -> list[str]:
+        """Current rank name of every registered player, in slot order."""
+        names = _RANK_FROM_INDEX
+        return [names[i] for i in self.rank_index]
+
+    def get_status(self, idx: int) -> RankStatus:
+        """Same record as PlayerRank.get_status for the player in slot idx."""
+        rank_idx = self.rank_index[idx]
+        return RankStatus(
+            self.names[idx],
+            _RANK_FROM_INDEX[rank_idx],
+            rank_idx,
+            _STATUS_VALUE[rank_idx],
+            _STATUS_BIAS[rank_idx],
+            bool(self.locked[idx])
+        )
+
+
+
 # Compatibility Wrapper Function
 
 
@@ -191,16 +320,12 @@ def get_rank_data(user_id: str, player_exp: PlayerEXP = None) -> tuple[str, floa
     if player_exp is not None:
         if not isinstance(player_exp, PlayerEXP):
             raise TypeError("player_exp must be a PlayerEXP instance.")
-        normalized_exp = get_normalized_exp(player_exp.exp)
-        rank_name = get_rank_name(normalized_exp)
-        _, bias = get_rank_value(rank_name)
-        return rank_name, bias
+        idx = _rank_index_from_exp(player_exp.exp)
+        return _RANK_FROM_INDEX[idx], RANK_BIAS[idx]
     
     # Default to novice rank if user_id lookup not implemented
     # In a full implementation, you'd look up the user's actual rank
-    rank_name = RANK_LEVELS[0]
-    _, bias = get_rank_value(rank_name)
-    return rank_name, bias
+    return _RANK_FROM_INDEX[0], RANK_BIAS[0]
 
 
 def get_rank_from_exp(exp: int) -> tuple[str, float]:
@@ -213,7 +338,5 @@ def get_rank_from_exp(exp: int) -> tuple[str, float]:
     Returns:
         tuple: (rank_name, bias_value)
     """
-    normalized_exp = get_normalized_exp(exp)
-    rank_name = get_rank_name(normalized_exp)
-    _, bias = get_rank_value(rank_name)
-    return rank_name, bias
\ No newline at end of file
+    idx = _rank_index_from_exp(exp)
+    return _RANK_FROM_INDEX[idx], RANK_BIAS[idx]
\ No newline at end of file
@@ -1,6 +1,6 @@
-
 from functools import lru_cache
-from math import sqrt, exp
+from math import sqrt, tanh
+from typing import NamedTuple
 
 # Configuration 
 MAX_ATTEMPTS = 100
@@ -15,17 +15,45 @@ SUCCESS_TIERS = [
 ]
 DEFAULT_TIER = {"level": "Beginner", "value": 0.10, "bias": 0.00}
 
+# Tier lookup by success_count_equiv (0..MAX_ATTEMPTS): _TIER_IDX maps each value to a row
+# of the parallel _TIER_LEVEL / _TIER_BIAS_BASE tuples; the last row is DEFAULT_TIER.
+_TIERS = (*SUCCESS_TIERS, DEFAULT_TIER)
+_TIER_LEVEL = tuple(t["level"] for t in _TIERS)
+_TIER_BIAS_BASE = tuple(t["bias"] for t in _TIERS)
+_TIER_IDX = tuple(
+    next((k for k, t in enumerate(SUCCESS_TIERS) if t["min"] <= i <= t["max"]), len(SUCCESS_TIERS))
+    for i in range(MAX_ATTEMPTS + 1)
+)
+
+
+# Result Records (immutable, so cached results can be shared safely)
+class SuccessDetails(NamedTuple):
+    puzzle_norm: float
+    battle_norm: float
+    gameplay_score: float
+    lesson_outcome: float
+    engagement_rate: float
+
+
+class SuccessResult(NamedTuple):
+    level: str
+    success_value: float
+    bias: float
+    normalized: float
+    details: SuccessDetails
+
 
 # Weighted Success Computation
+SUCCESS_CACHE_SIZE = 4096
+
 
-@lru_cache(maxsize=None)
 def compute_success(
     puzzle_success: int,
     battle_success: int,
     gameplay_score: float,
     lesson_outcome: float,
     engagement_rate: float
-) -> dict:
+) -> SuccessResult:
     """
     Compute player's total success value across multiple performance dimensions.
     
@@ -37,22 +65,32 @@ def compute_success(
         engagement_rate (float): Daily/weekly consistency (0–1).
 
     Returns:
-        dict: {
-            "level": str,
-            "success_value": float,
-            "bias": float,
-            "normalized": float,
-            "details": {...}
-        }
-    """
+        SuccessResult: (level, success_value, bias, normalized, details), where
+        details is a SuccessDetails record. Use ._asdict() for a dict view.
 
-    # Input validation 
+    Results are cached on the exact inputs in a bounded LRU.
+    """
+    # Input validation (done once here; the cached core trusts its arguments)
     for val in (puzzle_success, battle_success):
         if not isinstance(val, int) or val < 0:
             raise ValueError("Success counts must be positive integers.")
     for val in (gameplay_score, lesson_outcome, engagement_rate):
         if not isinstance(val, (int, float)) or not (0.0 <= val <= 1.0):
             raise ValueError("Gameplay metrics must be between 0.0 and 1.0")
+    return _compute_success_impl(
+        puzzle_success, battle_success, gameplay_score, lesson_outcome, engagement_rate
+    )
+
+
+@lru_cache(maxsize=SUCCESS_CACHE_SIZE)
+def _compute_success_impl(
+    puzzle_success: int,
+    battle_success: int,
+    gameplay_score: float,
+    lesson_outcome: float,
+    engagement_rate: float
+) -> SuccessResult:
+    """Cached core of compute_success (inputs already validated)."""
 
     #Normalize and balance weights 
     puzzle_norm = min(puzzle_success / MAX_ATTEMPTS, 1.0)
@@ -67,35 +105,51 @@ def compute_success(
         (0.10 * (engagement_rate * DECAY_RATE))
     )
 
-    # Clamp
-    weighted_success = max(0.0, min(weighted_success, 1.0))
+    # Clamp (compare chain: no min/max builtin calls)
+    weighted_success = (
+        0.0 if weighted_success < 0.0 else
+        (1.0 if weighted_success > 1.0 else weighted_success)
+    )
 
     #  Tier classification 
-    success_count_equiv = int(weighted_success * MAX_ATTEMPTS)
-    tier = next((t for t in SUCCESS_TIERS if t["min"] <= success_count_equiv <= t["max"]), DEFAULT_TIER)
+    tier = _TIER_IDX[int(weighted_success * MAX_ATTEMPTS)]
 
     #  Dynamic bias scaling 
-    dynamic_bias = tier["bias"] + (sqrt(weighted_success) * 0.02)
+    dynamic_bias = _TIER_BIAS_BASE[tier] + (sqrt(weighted_success) * 0.02)
 
     # Adaptive normalization (smooth transition across tiers) 
-    normalized = 1 / (1 + exp(-6 * (weighted_success - 0.5)))
-
-    return {
-        "level": tier["level"],
-        "success_value": round(weighted_success, 4),
-        "bias": round(dynamic_bias, 4),
-        "normalized": round(normalized, 4),
-        "details": {
-            "puzzle_norm": round(puzzle_norm, 3),
-            "battle_norm": round(battle_norm, 3),
-            "gameplay_score": round(gameplay_score, 3),
-            "lesson_outcome": round(lesson_outcome, 3),
-            "engagement_rate": round(engagement_rate, 3)
-        }
-    }
-
-
-@lru_cache(maxsize=MAX_ATTEMPTS + 1)
+    # logistic(6 * (x - 0.5)) written via tanh: one C call, no division
+    normalized = 0.5 * (1.0 + tanh(3.0 * (weighted_success - 0.5)))
+
+    return SuccessResult(
+        _TIER_LEVEL[tier],
+        round(weighted_success, 4),
+        round(dynamic_bias, 4),
+        round(normalized, 4),
+        SuccessDetails(
+            round(puzzle_norm, 3),
+            round(battle_norm, 3),
+            round(gameplay_score, 3),
+            round(lesson_outcome, 3),
+            round(engagement_rate, 3)
+        )
+    )
+
+
+# Success Rate Table: every count in [0, MAX_ATTEMPTS], rounded once at import
+def _build_success_rates() -> tuple[tuple[str, float, float], ...]:
+    rates = []
+    for success_count in range(MAX_ATTEMPTS + 1):
+        normalized = success_count / MAX_ATTEMPTS
+        tier = _TIER_IDX[int(normalized * MAX_ATTEMPTS)]
+        dynamic_bias = _TIER_BIAS_BASE[tier] + (sqrt(normalized) * 0.02)
+        rates.append((_TIER_LEVEL[tier], round(normalized, 4), round(dynamic_bias, 4)))
+    return tuple(rates)
+
+
+_SUCCESS_RATES = _build_success_rates()
+
+
 def get_success_rate(success_count: int) -> tuple[str, float, float]:
     """
     Fast wrapper function for success rate calculation.
@@ -108,16 +162,5 @@ def get_success_rate(success_count: int) -> tuple[str, float, float]:
         tuple: (level_name, normalized_success_rate, bias_value)
     """
     if not isinstance(success_count, int) or success_count < 0:
-        success_count = 0
-    
-    # Use simplified calculation for speed (only puzzle success, assume defaults for others)
-    normalized = min(success_count / MAX_ATTEMPTS, 1.0)
-    success_count_equiv = int(normalized * MAX_ATTEMPTS)
-    
-    # Find matching tier
-    tier = next((t for t in SUCCESS_TIERS if t["min"] <= success_count_equiv <= t["max"]), DEFAULT_TIER)
-    
-    # Calculate dynamic bias
-    dynamic_bias = tier["bias"] + (sqrt(normalized) * 0.02)
-    
-    return tier["level"], round(normalized, 4), round(dynamic_bias, 4)
\ No newline at end of file
+        return _SUCCESS_RATES[0]
+    return _SUCCESS_RATES[success_count if success_count < MAX_ATTEMPTS else MAX_ATTEMPTS]
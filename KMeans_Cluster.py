@@ -10,15 +10,18 @@ Key Functions: kmeans_from_irt(), init_kmeans_plus_plus(), normalize_data()
 Returns: Centroids and cluster assignments
 """
 
-import math
 import random
+from bisect import bisect_left
+from itertools import accumulate
+from math import dist
+from operator import itemgetter
 
 # Vector Math Utilities: Distance calculations and centroid computation
 
 # Euclidean Distance: sqrt(sum((a_i - b_i)^2)) - finds nearest centroid
 def euclidean_distance(a, b):
     """Return Euclidean distance between two numeric vectors."""
-    return math.sqrt(squared_distance(a, b))
+    return dist(a, b)
 
 
 # Squared Distance: Faster than euclidean (no sqrt) - preserves ordering for comparisons
@@ -36,15 +39,9 @@ def compute_centroid(points):
     """Compute the centroid for a list of k-dimensional points."""
     if not points:
         return []
-    count = len(points)
-    dim = len(points[0])
-    # Efficient single pass through points; avoids repeatedly dividing inside loop
-    centroid = [0.0] * dim
-    for point in points:
-        for i in range(dim):
-            centroid[i] += point[i]
-    inv_count = 1.0 / count
-    return [centroid[i] * inv_count for i in range(dim)]
+    # Column sums run in C via zip/sum; multiply by the inverse once per dimension
+    inv_count = 1.0 / len(points)
+    return [sum(column) * inv_count for column in zip(*points)]
 
 
 # Normalize Data: Scales features to [0,1] so all features contribute equally to distance
@@ -57,29 +54,16 @@ def normalize_data(data):
     if not data:
         return data
 
-    dims = len(data[0])
-    mins = list(data[0])
-    maxs = list(data[0])
+    # Per-dimension min/max computed column-wise in C.
+    columns = list(zip(*data))
+    mins = [min(column) for column in columns]
+    ranges = [max(column) - lo for column, lo in zip(columns, mins)]
+    bounds = list(zip(mins, ranges))
 
-    # Single pass to find min/max per dimension.
-    for pt in data[1:]:
-        for i in range(dims):
-            if pt[i] < mins[i]:
-                mins[i] = pt[i]
-            if pt[i] > maxs[i]:
-                maxs[i] = pt[i]
-
-    norm_data = []
-    ranges = [maxs[i] - mins[i] for i in range(dims)]
-
-    for pt in data:
-        scaled = [
-            0.0 if ranges[i] == 0.0 else (pt[i] - mins[i]) / ranges[i]
-            for i in range(dims)
-        ]
-        norm_data.append(scaled)
-
-    return norm_data
+    return [
+        [0.0 if r == 0.0 else (x - lo) / r for x, (lo, r) in zip(pt, bounds)]
+        for pt in data
+    ]
 
 
 # K-Means++ Init: Smart centroid initialization (better than random)
@@ -97,36 +81,73 @@ def init_kmeans_plus_plus(data, k):
         return data.copy()
 
     centroids = [random.choice(data)]
+    # Running nearest-centroid distance per point: each round only measures
+    # against the newest centroid, so init is O(k*n*d) instead of O(k^2*n*d)
+    min_dist_sq = [squared_distance(pt, centroids[0]) for pt in data]
 
     while len(centroids) < k:
-        min_dist_sq = []
-        for pt in data:
-            min_sq = float('inf')
-            for c in centroids:
-                sq_dist = squared_distance(pt, c)
-                if sq_dist < min_sq:
-                    min_sq = sq_dist
-            min_dist_sq.append(min_sq)
+        if len(centroids) > 1:
+            newest = centroids[-1]
+            min_dist_sq = [
+                sq if sq <= (new_sq := squared_distance(pt, newest)) else new_sq
+                for pt, sq in zip(data, min_dist_sq)
+            ]
 
         total = sum(min_dist_sq)
         if total == 0 or total < 1e-10:
-            remaining = [pt for pt in data if pt not in centroids]
-            if remaining:
-                centroids.append(random.choice(remaining))
+            # A point coincides with a centroid exactly when its min distance is 0,
+            # so the distances already identify the remaining points (no list compares)
+            remaining_idx = [i for i, d in enumerate(min_dist_sq) if d > 0.0]
+            if remaining_idx:
+                centroids.append(data[random.choice(remaining_idx)])
             break
 
+        # Weighted pick: first index whose cumulative distance reaches r
         r = random.random() * total
-        cumulative = 0.0
-        for i, d in enumerate(min_dist_sq):
-            cumulative += d
-            if r <= cumulative:
-                centroids.append(data[i])
-                break
-        else:
-            centroids.append(data[-1])
+        i = bisect_left(list(accumulate(min_dist_sq)), r)
+        centroids.append(data[i] if i < n else data[-1])
 
     return centroids
 
+# Assignment Kernel: Nearest-centroid pass over all points (the k-means hot loop)
+# Self-contained (lists and floats only) so it can be swapped for a compiled kernel
+def _assign_points(points, centroids, k):
+    """
+    Return (assignments, clusters) for one k-means iteration. math.dist runs in C;
+    sqrt is monotonic so the nearest centroid matches the squared-distance choice.
+    Points are grouped rather than summed in place: in pure Python, per-point
+    running sums cost more than one C-level zip/sum pass in compute_centroid.
+    """
+    _dist = dist
+    inf = float('inf')
+    indexed_centroids = list(enumerate(centroids))
+    clusters = [[] for _ in range(k)]
+    assignments = [0] * len(points)
+    for i, pt in enumerate(points):
+        min_dist = inf
+        nearest = 0
+        for idx, centroid in indexed_centroids:
+            d = _dist(pt, centroid)
+            if d < min_dist:
+                min_dist = d
+                nearest = idx
+        assignments[i] = nearest
+        clusters[nearest].append(pt)
+    return assignments, clusters
+
+
+# Feature Extraction: one C-level itemgetter call per row, .get() defaults only if a key is missing
+_FEATURE_KEYS = ("adjusted_theta", "probability", "success_rate", "fail_rate")
+_get_features = itemgetter(*_FEATURE_KEYS)
+
+
+def _extract_features(irt_data):
+    try:
+        return [_get_features(item) for item in irt_data]
+    except KeyError:
+        return [tuple(item.get(key, 0.0) for key in _FEATURE_KEYS) for item in irt_data]
+
+
 # Main Clustering Function: Groups players into k skill-based clusters
 def kmeans_from_irt(irt_data, k=3, max_iter=100, tol=1e-4, verbose=False):
     """
@@ -137,15 +158,7 @@ def kmeans_from_irt(irt_data, k=3, max_iter=100, tol=1e-4, verbose=False):
 
     # Convert IRT rows into numeric feature vectors composed of
     # adjusted_theta, probability, success_rate, and fail_rate.
-    data_points = [
-        [
-            item.get("adjusted_theta", 0.0),
-            item.get("probability", 0.0),
-            item.get("success_rate", 0.0),
-            item.get("fail_rate", 0.0)
-        ]
-        for item in irt_data
-    ]
+    data_points = _extract_features(irt_data)
 
     if not data_points:
         raise ValueError("IRT data is empty. Cannot perform K-Means clustering.")
@@ -157,22 +170,13 @@ def kmeans_from_irt(irt_data, k=3, max_iter=100, tol=1e-4, verbose=False):
     centroids = init_kmeans_plus_plus(data_points, k)
 
     # Standard k-means loop with early stopping when centroids barely move.
+    # Shifts are compared squared, so square the tolerance once up front.
+    tol_sq = tol * tol
+    loose_tol_sq = tol_sq * 10
     assignments = []
     for iteration in range(max_iter):
-        clusters = [[] for _ in range(k)]
-        
         # Assign each data point to the nearest centroid.
-        assignments = []
-        for pt in data_points:
-            min_dist_sq = float('inf')
-            nearest = 0
-            for idx, centroid in enumerate(centroids):
-                dist_sq = squared_distance(pt, centroid)
-                if dist_sq < min_dist_sq:
-                    min_dist_sq = dist_sq
-                    nearest = idx
-            assignments.append(nearest)
-            clusters[nearest].append(pt)
+        assignments, clusters = _assign_points(data_points, centroids, k)
 
         # Rebuild centroids for the new clusters.
         new_centroids = []
@@ -187,7 +191,7 @@ def kmeans_from_irt(irt_data, k=3, max_iter=100, tol=1e-4, verbose=False):
         shift_sq = sum(squared_distance(a, b) for a, b in zip(centroids, new_centroids))
         
         # Early convergence check.
-        if shift_sq < (tol * tol):
+        if shift_sq < tol_sq:
             if verbose:
                 print(f"[INFO] K-Means converged after {iteration + 1} iterations")
             break
@@ -195,7 +199,7 @@ def kmeans_from_irt(irt_data, k=3, max_iter=100, tol=1e-4, verbose=False):
         centroids = new_centroids
         
         #Additional early stopping: if shift is very small after few iterations
-        if iteration > 5 and shift_sq < (tol * tol * 10):
+        if iteration > 5 and shift_sq < loose_tol_sq:
             break
 
     else:
@@ -10,21 +10,55 @@ Features: Batch processing, caching, optimized matching, cross-cluster support
 Rules: Same rank (5 players) or cross-rank (3-4 players) with algorithm
 """
 
-from typing import List, Dict, Optional, Tuple
+from collections import OrderedDict
+from operator import itemgetter, sub
+from sys import float_info
+from typing import List, Dict, NamedTuple, Optional, Tuple
 from KMeans_Cluster import kmeans_from_irt, squared_distance
-from SkillBasedMatchMaking import find_best_match
-from IRT_Algo import irt_probability
+from SkillBasedMatchMaking import _find_best_match, build_cluster_lookup
+from IRT_Algo import batch_irt_probability
+
+
+# Cache Key Fields: one C-level itemgetter call per IRT row
+_get_cache_fields = itemgetter("adjusted_theta", "probability")
+
+
+# Group Variance: Two-pass population variance of a group's thetas
+# Plain loop with d * d: no generator frame, and exactly rounded (libm pow(d, 2) is not always)
+def _group_variance(thetas: List[float]) -> float:
+    n = len(thetas)
+    mean_theta = sum(thetas) / n
+    total = 0.0
+    for t in thetas:
+        d = t - mean_theta
+        total += d * d
+    return total / n
+
+
+# Player Batch: Structure-of-arrays player profiles (one list per field, indexed by player position)
+# theta is the IRT-adjusted theta used for matching; original_theta is the raw input
+class PlayerBatch(NamedTuple):
+    user_id: List[str]
+    theta: List[float]
+    beta: List[float]
+    original_theta: List[float]
+    success_count: List[int]
+    fail_count: List[int]
+    rank_name: List[str]
+    achievements: List[int]
 
 
 # Multiplayer Matchmaker Class: Orchestrates entire matchmaking pipeline
 class MultiplayerMatchmaker:
     # k_clusters: Number of clusters, max_iter: Max iterations, tolerance: Convergence threshold
-    # _clustering_cache: Cache to avoid re-clustering identical player sets
-    def __init__(self, k_clusters: int = 3, max_iter: int = 100, tolerance: float = 1e-4):
+    # _clustering_cache: LRU cache (at most cache_size entries) to avoid re-clustering identical player sets
+    def __init__(self, k_clusters: int = 3, max_iter: int = 100, tolerance: float = 1e-4,
+                 cache_size: int = 64):
         self.k_clusters = k_clusters
         self.max_iter = max_iter
         self.tolerance = tolerance
-        self._clustering_cache = {}  
+        self.cache_size = cache_size
+        self._clustering_cache = OrderedDict()
     
     # Prepare Player Data: Converts raw data to clustering/matching format
     # Process: Extract stats → Pre-compute IRT → Calculate rates → Build vectors → Store profiles
@@ -34,33 +68,61 @@ class MultiplayerMatchmaker:
         clustering and later scoring. Also caches IRT outputs so we don't
         recompute them multiple times.
         """
+        irt_data, data_points, batch = self._prepare_player_batch(players)
+        #Per-player profile dicts are built only here, at the API boundary
+        player_profiles = [
+            {
+                "theta": adjusted_theta,
+                "beta": beta,
+                "original_theta": theta,
+                "success_count": success_count,
+                "fail_count": fail_count,
+                "rank_name": rank_name,
+                "achievements": achievements
+            }
+            for adjusted_theta, beta, theta, success_count, fail_count, rank_name, achievements in zip(
+                batch.theta, batch.beta, batch.original_theta, batch.success_count,
+                batch.fail_count, batch.rank_name, batch.achievements
+            )
+        ]
+        return irt_data, data_points, player_profiles
+
+    # Prepare Player Batch: Same pipeline as prepare_player_data, profiles kept as parallel columns
+    def _prepare_player_batch(self, players: List[Dict]) -> Tuple[List[Dict], List[List[float]], "PlayerBatch"]:
         n = len(players)
         #Pre-allocate lists for better performance
         irt_data = [None] * n
         data_points = [None] * n
-        player_profiles = [None] * n
-        
-        #Pre-compute all IRT/DDA in batch (single pass)
+
+        #Extract player info into parallel columns (single pass)
+        user_ids = [None] * n
+        thetas = [0.0] * n
+        betas = [0.5] * n
+        success_counts = [0] * n
+        fail_counts = [0] * n
+        rank_names = [None] * n
+        achievements_list = [0] * n
         for idx, player in enumerate(players):
-            # Extract player info (optimized)
-            user_id = player.get("user_id", f"player_{idx}")
-            theta = float(player.get("theta", 0.0))
-            beta = float(player.get("beta", 0.5))
-            success_count = int(player.get("success_count", 0))
-            fail_count = int(player.get("fail_count", 0))
-            rank_name = str(player.get("rank_name", "novice"))
-            achievements = int(player.get("completed_achievements", 0))
-            
-            #Compute IRT metrics ONCE per player
-            irt_result = irt_probability(
-                theta=theta,
-                beta=beta,
-                rank_name=rank_name,
-                completed_achievements=achievements,
-                success_count=success_count,
-                fail_count=fail_count
-            )
-            
+            user_ids[idx] = player.get("user_id", f"player_{idx}")
+            thetas[idx] = float(player.get("theta", 0.0))
+            betas[idx] = float(player.get("beta", 0.5))
+            success_counts[idx] = int(player.get("success_count", 0))
+            fail_counts[idx] = int(player.get("fail_count", 0))
+            rank_names[idx] = str(player.get("rank_name", "novice"))
+            achievements_list[idx] = int(player.get("completed_achievements", 0))
+
+        #Compute IRT metrics for all players in one batched call
+        adjusted_thetas, probabilities = batch_irt_probability(
+            thetas, betas, achievements_list, success_counts, fail_counts
+        )
+
+        for idx in range(n):
+            beta = betas[idx]
+            success_count = success_counts[idx]
+            fail_count = fail_counts[idx]
+            rank_name = rank_names[idx]
+            achievements = achievements_list[idx]
+
             #Calculate success/fail rates
             total_attempts = success_count + fail_count
             if total_attempts > 0:
@@ -71,27 +133,16 @@ class MultiplayerMatchmaker:
                 success_rate = 0.5
                 fail_rate = 0.5
             
-            adjusted_theta = irt_result.get("adjusted_theta", theta)
-            
-            #Store pre-computed profile for matchmaking
-            player_profiles[idx] = {
-                "theta": adjusted_theta,
-                "beta": beta,
-                "original_theta": theta,
-                "success_count": success_count,
-                "fail_count": fail_count,
-                "rank_name": rank_name,
-                "achievements": achievements
-            }
+            adjusted_theta = adjusted_thetas[idx]
             
             #Build IRT data entry for clustering
             irt_entry = {
                 "adjusted_theta": adjusted_theta,
-                "probability": irt_result.get("probability", 0.5),
+                "probability": probabilities[idx],
                 "success_rate": success_rate,
                 "fail_rate": fail_rate,
                 "_player_info": {
-                    "user_id": user_id,
+                    "user_id": user_ids[idx],
                     "rank_name": rank_name,
                     "completed_achievements": achievements,
                     "success_count": success_count,
@@ -105,7 +156,11 @@ class MultiplayerMatchmaker:
             irt_data[idx] = irt_entry
             data_points[idx] = data_point
         
-        return irt_data, data_points, player_profiles
+        batch = PlayerBatch(
+            user_ids, adjusted_thetas, betas, thetas, success_counts,
+            fail_counts, rank_names, achievements_list
+        )
+        return irt_data, data_points, batch
     
     # Cluster Players: Groups players using K-Means (with caching to avoid redundant clustering)
     def cluster_players(self, irt_data: List[Dict], use_cache: bool = True) -> Dict:
@@ -120,12 +175,17 @@ class MultiplayerMatchmaker:
         
         # Check cache first (using data hash for better cache hits)
         if use_cache:
-            cache_key = hash(tuple(
-                (d.get("adjusted_theta", 0), d.get("probability", 0))
-                for d in irt_data
-            ))
-            if cache_key in self._clustering_cache:
-                return self._clustering_cache[cache_key]
+            try:
+                cache_key = hash(tuple(map(_get_cache_fields, irt_data)))
+            except KeyError:
+                cache_key = hash(tuple(
+                    (d.get("adjusted_theta", 0), d.get("probability", 0))
+                    for d in irt_data
+                ))
+            cached = self._clustering_cache.get(cache_key)
+            if cached is not None:
+                self._clustering_cache.move_to_end(cache_key)
+                return cached
         
         # Perform clustering
         clustering_result = kmeans_from_irt(
@@ -139,6 +199,8 @@ class MultiplayerMatchmaker:
         # Cache result
         if use_cache:
             self._clustering_cache[cache_key] = clustering_result
+            if len(self._clustering_cache) > self.cache_size:
+                self._clustering_cache.popitem(last=False)
         
         return clustering_result
     
@@ -156,7 +218,7 @@ class MultiplayerMatchmaker:
             return []
         
         # Prepare data with pre-computed profiles
-        irt_data, data_points, player_profiles = self.prepare_player_data(players)
+        irt_data, data_points, batch = self._prepare_player_batch(players)
         
         # Cluster players
         clustering = self.cluster_players(irt_data)
@@ -168,7 +230,9 @@ class MultiplayerMatchmaker:
             cluster_map.setdefault(cluster_id, []).append(idx)
         
         # Sort players by theta for better matching
-        all_indices = list(range(len(players)))
+        # The batch's flat theta column (indexed by player position) replaces profile dict lookups
+        theta_of = batch.theta
+        theta_key = theta_of.__getitem__
         
         # Use optimized matching algorithm
         matches = []
@@ -178,50 +242,60 @@ class MultiplayerMatchmaker:
         #Match within clusters first, then cross-cluster
         for cluster_id, cluster_indices in sorted(cluster_map.items()):
             #Sort cluster by theta for better matching
-            cluster_indices.sort(key=lambda i: player_profiles[i]["theta"])
+            cluster_indices.sort(key=theta_key)
             available = [i for i in cluster_indices if i not in matched_players]
+            available_thetas = [theta_of[i] for i in available]
             
             #Group matching (much faster than individual calls)
             while len(available) >= match_size:
-                match_group = self._find_best_group_fast(
-                    available, player_profiles, match_size, min_match_score
+                window = self._find_best_window(
+                    available_thetas, match_size, min_match_score
                 )
                 
-                if match_group and len(match_group) == match_size:
+                if window is not None:
+                    start, variance = window
+                    match_group = available[start:start + match_size]
                     matches.append({
                         "players": [players[i] for i in match_group],
                         "cluster": cluster_id,
-                        "match_score": self._calculate_group_score(match_group, player_profiles),
+                        "match_score": self._score_from_variance(variance, match_size),
                         "details": {"match_type": "optimized_cluster"}
                     })
                     matched_players.update(match_group)
-                    #Remove matched players
-                    available = [i for i in available if i not in match_group]
+                    #Remove matched players (one consecutive slice, spliced out in C)
+                    del available[start:start + match_size]
+                    del available_thetas[start:start + match_size]
                 else:
                     #Remove first player if no match found
                     available.pop(0)
+                    available_thetas.pop(0)
         
         # Cross-cluster matching if enabled
         if allow_cross_cluster:
             remaining = sorted([i for i in range(len(players)) if i not in matched_players],
-                             key=lambda i: player_profiles[i]["theta"])
+                             key=theta_key)
+            remaining_thetas = [theta_of[i] for i in remaining]
             
             while len(remaining) >= match_size:
-                match_group = self._find_best_group_fast(
-                    remaining, player_profiles, match_size, min_match_score
+                window = self._find_best_window(
+                    remaining_thetas, match_size, min_match_score
                 )
                 
-                if match_group and len(match_group) == match_size:
+                if window is not None:
+                    start, variance = window
+                    match_group = remaining[start:start + match_size]
                     matches.append({
                         "players": [players[i] for i in match_group],
                         "cluster": "cross_cluster",
-                        "match_score": self._calculate_group_score(match_group, player_profiles),
+                        "match_score": self._score_from_variance(variance, match_size),
                         "details": {"match_type": "optimized_cross_cluster"}
                     })
                     matched_players.update(match_group)
-                    remaining = [i for i in remaining if i not in match_group]
+                    del remaining[start:start + match_size]
+                    del remaining_thetas[start:start + match_size]
                 else:
                     remaining.pop(0)
+                    remaining_thetas.pop(0)
         
         return matches
     
@@ -233,51 +307,77 @@ class MultiplayerMatchmaker:
         Fast heuristic for forming a match group. For 1v1 we just look at neighbors;
         for bigger team sizes we minimize theta variance across consecutive windows.
         """
-       
-        if len(candidates) < match_size:
+        window = self._find_best_window(
+            [profiles[i]["theta"] for i in candidates], match_size, min_score
+        )
+        if window is None:
+            return None
+        start = window[0]
+        return candidates[start:start + match_size]
+
+    # Find Best Window: (start, variance) of the best consecutive group (or None)
+    # thetas are the candidates' thetas in candidate order. Groups are always consecutive,
+    # so callers can splice them out with one del, and the variance is the same two-pass
+    # value _calculate_group_score would compute
+    def _find_best_window(self, thetas: List[float], match_size: int,
+        min_score: float) -> Optional[Tuple[int, float]]:
+        if len(thetas) < match_size:
             return None
         
         # For match_size=2, use simple nearest neighbor
         if match_size == 2:
-            if len(candidates) < 2:
+            if len(thetas) < 2:
                 return None
-            #Find best pair by minimizing theta difference
-            best_pair = [candidates[0], candidates[1]]
-            min_diff = abs(profiles[candidates[0]]["theta"] - profiles[candidates[1]]["theta"])
-            
-            for i in range(len(candidates) - 1):
-                diff = abs(profiles[candidates[i]]["theta"] - profiles[candidates[i+1]]["theta"])
-                if diff < min_diff:
-                    min_diff = diff
-                    best_pair = [candidates[i], candidates[i+1]]
+            #Find best pair by minimizing theta difference (neighbor diffs, min and index run in C)
+            diffs = list(map(abs, map(sub, thetas[1:], thetas)))
+            min_diff = min(diffs)
+            best_start = diffs.index(min_diff)
             
             #Calculate score
             score = 1.0 - min(min_diff, 1.0)
             if score >= min_score:
-                return best_pair
+                return best_start, _group_variance(thetas[best_start:best_start + 2])
             return None
         
         # For larger groups, use consecutive window approach
-        # Select consecutive players with lowest variance
-        best_group = None
-        best_variance = float('inf')
-        
-        for start in range(len(candidates) - match_size + 1):
-            group = candidates[start:start + match_size]
-            thetas = [profiles[i]["theta"] for i in group]
-            
-            #Calculate variance (lower = more balanced)
-            mean_theta = sum(thetas) / len(thetas)
-            variance = sum((t - mean_theta) ** 2 for t in thetas) / len(thetas)
-            
-            if variance < best_variance:
-                best_variance = variance
-                best_group = group
-        
-        if best_group:
-            score = 1.0 - min(best_variance * 4, 1.0)
-            if score >= min_score:
-                return best_group
+        # Select consecutive players with lowest variance. The window sums slide in O(1)
+        # per step (on thetas shifted by the middle one, so the sums stay small); that
+        # variance only settles clear wins. Windows within round-off (tol) of the best
+        # are compared on the two-pass variance, so ties still go to the first window
+        n = len(thetas)
+        ref = thetas[n // 2]
+        shifted = [t - ref for t in thetas]
+        spread = max(thetas) - min(thetas)
+        tol = 64 * (n + match_size) * float_info.epsilon * spread * spread
+        s1 = 0.0
+        s2 = 0.0
+        for x in shifted[:match_size]:
+            s1 += x
+            s2 += x * x
+
+        best_start = 0
+        best_fast = s2 / match_size - (s1 / match_size) ** 2
+        best_variance = None  # two-pass variance of best_start, computed when needed
+        for start in range(1, n - match_size + 1):
+            old = shifted[start - 1]
+            new = shifted[start + match_size - 1]
+            s1 += new - old
+            s2 += new * new - old * old
+            fast = s2 / match_size - (s1 / match_size) ** 2
+            if fast < best_fast - tol:
+                best_start, best_fast, best_variance = start, fast, None
+            elif fast <= best_fast + tol:
+                variance = _group_variance(thetas[start:start + match_size])
+                if best_variance is None:
+                    best_variance = _group_variance(thetas[best_start:best_start + match_size])
+                if variance < best_variance:
+                    best_start, best_fast, best_variance = start, fast, variance
+
+        if best_variance is None:
+            best_variance = _group_variance(thetas[best_start:best_start + match_size])
+        score = 1.0 - min(best_variance * 4, 1.0)
+        if score >= min_score:
+            return best_start, best_variance
         
         return None
     
@@ -287,11 +387,14 @@ class MultiplayerMatchmaker:
         if len(group) < 2:
             return 0.0
         
-        thetas = [profiles[i]["theta"] for i in group]
-        mean_theta = sum(thetas) / len(thetas)
-        variance = sum((t - mean_theta) ** 2 for t in thetas) / len(thetas)
-        
-        # Lower variance = higher score
+        variance = _group_variance([profiles[i]["theta"] for i in group])
+        return self._score_from_variance(variance, len(group))
+
+    # Score From Variance: Lower variance = higher score (groups under 2 players score 0)
+    @staticmethod
+    def _score_from_variance(variance: float, group_size: int) -> float:
+        if group_size < 2:
+            return 0.0
         return round(1.0 - min(variance * 4, 1.0), 3)
     
     def _find_optimal_match_group_legacy(
@@ -310,6 +413,8 @@ class MultiplayerMatchmaker:
         
         # Get primary player info
         primary_info = irt_data[primary_idx]["_player_info"]
+        # Every _find_best_match call below uses the same roster: assign clusters once
+        cluster_lookup = build_cluster_lookup(data_points, centroids)
         
         # Evaluate all possible match combinations
         best_match = None
@@ -319,25 +424,26 @@ class MultiplayerMatchmaker:
         if match_size == 2:
             # Simple 1v1 matching
             for candidate_idx in candidate_indices:
-                match_result = find_best_match(
+                match_result = _find_best_match(
                     player_index=primary_idx,
                     data_points=data_points,
                     centroids=centroids,
                     rank_name=primary_info["rank_name"],
                     completed_achievements=primary_info["completed_achievements"],
                     success_count=primary_info["success_count"],
-                    fail_count=primary_info["fail_count"]
+                    fail_count=primary_info["fail_count"],
+                    cluster_lookup=cluster_lookup
                 )
                 
-                match_idx = match_result.get("match_index")
+                match_idx = match_result.match_index
                 if match_idx == candidate_idx:
-                    score = match_result.get("match_score", 0.0)
+                    score = match_result.match_score
                     if score > best_score and score >= min_score:
                         best_score = score
                         best_match = {
                             "matched_indices": [primary_idx, candidate_idx],
                             "match_score": score,
-                            "details": match_result
+                            "details": match_result.as_dict()
                         }
                         # Early termination if perfect match found
                         if score >= 0.95:
@@ -359,18 +465,19 @@ class MultiplayerMatchmaker:
                     
                     for selected_idx in selected:
                         candidate_info = irt_data[candidate_idx]["_player_info"]
-                        match_result = find_best_match(
+                        match_result = _find_best_match(
                             player_index=selected_idx,
                             data_points=data_points,
                             centroids=centroids,
                             rank_name=candidate_info["rank_name"],
                             completed_achievements=candidate_info["completed_achievements"],
                             success_count=candidate_info["success_count"],
-                            fail_count=candidate_info["fail_count"]
+                            fail_count=candidate_info["fail_count"],
+                            cluster_lookup=cluster_lookup
                         )
                         
-                        if match_result.get("match_index") == candidate_idx:
-                            avg_score += match_result.get("match_score", 0.0)
+                        if match_result.match_index == candidate_idx:
+                            avg_score += match_result.match_score
                             count += 1
                     
                     if count > 0:
@@ -6,7 +6,7 @@ DDA to predict success probability and pick the next puzzle difficulty/beta.
 """
 
 from functools import lru_cache
-from IRT_Algo import irt_probability
+from IRT_Algo import IRTProbability, irt_probability_fast
 from DDA_Algo import DDASystem
 from algo_config import clamp_beta, BETA_MIN, BETA_MAX
 from RankBases.EXP import PlayerEXP
@@ -14,11 +14,36 @@ from RankBases.EXP import PlayerEXP
 # Initialize the DDA system once for continuity and performance.
 _dda_system = DDASystem(stability_threshold=0.05, momentum_factor=0.6)
 
-# Cache for recent results to avoid redundant calculations.
+# Cache for the most recent result. DDA carries momentum between calls, so only an
+# immediate repeat of the same inputs may reuse a result; a multi-entry cache would
+# return outputs computed under an older DDA state.
 _last_inputs = {}
 _last_result = None
 
 
+@lru_cache(maxsize=128)
+def _irt_probability_cached(
+    theta: float,
+    beta: float,
+    rank_name: str,
+    completed_achievements: int,
+    success_count: int,
+    fail_count: int,
+    exp: int
+) -> IRTProbability:
+    # IRT is pure in its inputs (unlike DDA), so it can be memoized across calls.
+    return irt_probability_fast(
+        theta=theta,
+        beta=beta,
+        rank_name=rank_name,
+        completed_achievements=completed_achievements,
+        success_count=success_count,
+        fail_count=fail_count,
+        exp=exp
+    )
+
+
+# Returns (success_rate, fail_rate) already rounded for the Summary, so cache hits skip round()
 @lru_cache(maxsize=256)
 def _compute_rates_cached(success_count: int, fail_count: int) -> tuple:
     total_attempts = success_count + fail_count
@@ -29,7 +54,7 @@ def _compute_rates_cached(success_count: int, fail_count: int) -> tuple:
     else:
         success_rate = 0.5
         fail_rate = 0.5
-    return success_rate, fail_rate
+    return round(success_rate, 3), round(fail_rate, 3)
 
 
 def run_puzzle_adjustment(
@@ -88,14 +113,15 @@ def run_puzzle_adjustment(
         return _last_result
     
     # Estimate learner's predicted performance using IRT (includes EXP bonuses).
-    irt_result = irt_probability(
-        theta=theta,
-        beta=beta_old,
-        rank_name=rank_name,
-        completed_achievements=completed_achievements,
-        success_count=success_count,
-        fail_count=fail_count,
-        exp=exp_value
+    # The memoized record is immutable; the dict for API consumers is built fresh below.
+    irt_record = _irt_probability_cached(
+        theta,
+        beta_old,
+        rank_name,
+        completed_achievements,
+        success_count,
+        fail_count,
+        exp_value
     )
     
     # Compute success/failure metrics (cached helper).
@@ -103,9 +129,9 @@ def run_puzzle_adjustment(
     
     
     # Dynamically adjust puzzle difficulty using DDA.
-    dda_result = _dda_system.adjust_difficulty(
+    dda_result = _dda_system.adjust_difficulty_fast(
         beta_old=beta_old,
-        irt_output=irt_result,
+        irt_result=irt_record,
         success_count=success_count,
         fail_count=fail_count,
         target_performance=target_performance,
@@ -113,8 +139,8 @@ def run_puzzle_adjustment(
     )
     
     # Extract all values in single pass for summary.
-    adjusted_theta = irt_result.get("adjusted_theta", theta)
-    probability = irt_result.get("probability", 0.5)
+    adjusted_theta = irt_record.adjusted_theta
+    probability = irt_record.probability
     
     beta_new = dda_result.get("beta_new", beta_old)
     difficulty_label = dda_result.get("difficulty_label", "Unknown")
@@ -135,13 +161,13 @@ def run_puzzle_adjustment(
     combined_result = {
         "user_id": user_id,
         "level_id": level_id,
-        "IRT_Result": irt_result,
+        "IRT_Result": irt_record._asdict(),
         "DDA_Result": dda_result,
         "Summary": {
             "Student_Skill": round(adjusted_theta, 3),
             "Predicted_Success_Probability": round(probability, 3),
-            "Actual_Success_Rate": round(success_rate, 3),
-            "Actual_Fail_Rate": round(fail_rate, 3),
+            "Actual_Success_Rate": success_rate,
+            "Actual_Fail_Rate": fail_rate,
             "Target_Performance": target_performance,
             "New_Beta": beta_new,
             "Next_Puzzle_Difficulty": difficulty_label,
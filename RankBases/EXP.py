@@ -1,4 +1,5 @@
 from functools import lru_cache
+from itertools import accumulate
 from time import time
 
 
@@ -15,6 +16,18 @@ LESSON_POINTS = 20
 MID_LEVEL_BONUS = 40
 FINAL_LEVEL_BONUS = 50
 
+# Lesson EXP per level (1..LESSON_LEVELS) and its running total, fixed at import;
+# _LESSON_CUMSUM[n] is the EXP for finishing levels 1..n with nothing skipped
+_LESSON_POINTS_BY_LEVEL = {
+    level: (
+        MID_LEVEL_BONUS if level == LESSON_LEVELS // 2
+        else FINAL_LEVEL_BONUS if level == LESSON_LEVELS
+        else LESSON_POINTS
+    )
+    for level in range(1, LESSON_LEVELS + 1)
+}
+_LESSON_CUMSUM = (0, *accumulate(_LESSON_POINTS_BY_LEVEL[level] for level in range(1, LESSON_LEVELS + 1)))
+
 # Anti-EXP-farming settings
 ANTI_FARM_COOLDOWN = 60     
 
@@ -26,7 +39,14 @@ _EXP_THRESHOLDS = tuple(i / 10 for i in range(11))
 # Core EXP Computation
 
 
-@lru_cache(maxsize=None)
+# Successful-attempt EXP for every (difficulty_level, streak) with streak <= _STREAK_TABLE_CAP
+_STREAK_TABLE_CAP = 64
+_EXP_GAIN_TABLE = tuple(
+    tuple(int(BASE_EXP_GAIN * multiplier * (1 + 0.05 * streak)) for streak in range(_STREAK_TABLE_CAP + 1))
+    for multiplier in DIFFICULTY_MULTIPLIER
+)
+
+
 def calculate_exp_gain(success: bool, difficulty_level: int = 1, streak: int = 0) -> int:
     """Computes gained EXP from a single puzzle attempt."""
     if not isinstance(success, bool):
@@ -37,6 +57,8 @@ def calculate_exp_gain(success: bool, difficulty_level: int = 1, streak: int = 0
         streak = 0
 
     if success:
+        if type(streak) is int and streak <= _STREAK_TABLE_CAP:
+            return _EXP_GAIN_TABLE[difficulty_level][streak]
         return int(BASE_EXP_GAIN * DIFFICULTY_MULTIPLIER[difficulty_level] * (1 + 0.05 * streak))
     else:
         return 0  
@@ -125,27 +147,37 @@ class PlayerEXP:
             raise TypeError("All participants must be PlayerEXP instances.")
 
         # Anti-farm check: prevent immediate rematch EXP abuse (optimized)
+        # One set intersection per player instead of scanning every opponent
         now = time()
+        names = {p.player_name for p in players}
         for p in players:
             if p._last_battle_time > 0:
                 elapsed = now - p._last_battle_time
                 if elapsed < ANTI_FARM_COOLDOWN:
-                    for opponent in players:
-                        if opponent.player_name != p.player_name and opponent.player_name in p.recent_opponents:
-                            raise ValueError(
-                                f"Anti-Farming: {p.player_name} recently battled {opponent.player_name}. Please wait {int(ANTI_FARM_COOLDOWN - elapsed)}s."
-                            )
-
-        # Deduct wagers and apply penalties
+                    overlap = p.recent_opponents & names
+                    overlap.discard(p.player_name)
+                    if overlap:
+                        # Report the first offender in participant order
+                        for opponent in players:
+                            if opponent.player_name in overlap:
+                                raise ValueError(
+                                    f"Anti-Farming: {p.player_name} recently battled {opponent.player_name}. Please wait {int(ANTI_FARM_COOLDOWN - elapsed)}s."
+                                )
+
+        # Deduct wagers and apply penalties as one clamped subtraction per player;
+        # level depends only on EXP, so it is recomputed once afterwards
         total_pool = 0
         for i, p in enumerate(players):
             wager = max(int(p.exp * 0.05), MIN_BATTLE_EXP_COST)
-            p.lose(wager)
             total_pool += wager
 
             # Penalty for not finishing code
-            if not completed_code_flags[i]:
-                p.lose(BATTLE_PENALTY_NO_CODE)
+            deduction = wager if completed_code_flags[i] else wager + BATTLE_PENALTY_NO_CODE
+            exp = p.exp - deduction
+            p.exp = exp if exp > 0 else 0
+
+        for p in players:
+            p._update_level()
 
         # Only winners who completed code receive EXP
         if not winner_indices:
@@ -156,10 +188,12 @@ class PlayerEXP:
             if 0 <= idx < len(players) and completed_code_flags[idx]:
                 players[idx].gain(share)
 
-        # Record battle timestamp for anti-farming
+        # Record battle timestamp for anti-farming (copy the shared name set, drop self)
         for p in players:
             p._last_battle_time = now
-            p.recent_opponents = {op.player_name for op in players if op.player_name != p.player_name}
+            opponents = set(names)
+            opponents.discard(p.player_name)
+            p.recent_opponents = opponents
 
   
     # Lesson System
@@ -170,22 +204,12 @@ class PlayerEXP:
         if levels_completed < 0 or levels_completed > LESSON_LEVELS:
             raise ValueError(f"levels_completed must be between 0 and {LESSON_LEVELS}")
 
-        skipped_levels = set(skipped_levels or [])
-        total_exp_gain = 0
-
-        # Optimize level loop - check skip set once per level
-        for level in range(1, levels_completed + 1):
-            if level in skipped_levels:
-                continue
-            # Precompute constants for efficiency
-            mid_level = LESSON_LEVELS // 2
-            if level == mid_level:
-                points = MID_LEVEL_BONUS
-            elif level == LESSON_LEVELS:
-                points = FINAL_LEVEL_BONUS
-            else:
-                points = LESSON_POINTS
-            total_exp_gain += points
+        # Start from the full prefix total and subtract only the skipped levels
+        total_exp_gain = _LESSON_CUMSUM[levels_completed]
+        for level in set(skipped_levels or []):
+            points = _LESSON_POINTS_BY_LEVEL.get(level)
+            if points is not None and level <= levels_completed:
+                total_exp_gain -= points
 
         # Keep only the earned EXP even if not finished in time
         if not finished_in_time:
@@ -8,9 +8,11 @@ Features: Adaptive weighting, cross-cluster fallback, IRT/DDA integration
 """
 
 import logging
-from typing import List, Dict, Optional, Tuple
+from functools import lru_cache
+from math import dist
+from typing import List, Dict, NamedTuple, Optional, Tuple
 from KMeans_Cluster import squared_distance
-from IRT_Algo import irt_probability
+from IRT_Algo import irt_probability_fast
 from DDA_Algo import DDASystem
 
 
@@ -28,6 +30,8 @@ def normalize(value: float, min_val: float, max_val: float) -> float:
 
 # Adaptive Weights: Adjusts theta/beta importance by consistency
 # Consistent players → trust beta more (60%), Volatile → trust theta more (60%)
+# Cached on the exact consistency value: success/attempt ratios repeat heavily across a batch
+@lru_cache(maxsize=256)
 def adaptive_weights(consistency: float) -> Tuple[float, float]:
     """
     Return theta/beta weights based on player consistency. Reliable players
@@ -53,20 +57,85 @@ def assign_clusters(data_points: List[List[float]], centroids: List[List[float]]
     Quick helper to map every player index to the centroid they belong to.
     Keeps cluster lookups O(1) when searching for opponents.
     """
+    return _assign_clusters_with_nearest(data_points, centroids)[0]
+
+
+def _assign_clusters_with_nearest(
+    data_points: List[List[float]], centroids: List[List[float]]
+) -> Tuple[Dict[int, List[int]], List[int]]:
+    """assign_clusters plus the nearest cluster index of every point (same pass)."""
+    # math.dist runs in C; sqrt is monotonic so the nearest centroid is unchanged.
+    # Clustering centroids may carry extra features after [theta, beta]; like
+    # squared_distance, compare only the points' leading dimensions. Narrower
+    # centroids (or ragged points, which math.dist rejects) are shape errors
+    if data_points:
+        width = len(data_points[0])
+        if any(len(centroid) < width for centroid in centroids):
+            raise ValueError("centroids must have at least as many features as the data points")
+        centroids = [centroid[:width] for centroid in centroids]
+    return _nearest_pass(data_points, centroids)
+
+
+def _nearest_pass(data_points, centroids) -> Tuple[Dict[int, List[int]], List[int]]:
     cluster_map = {i: [] for i in range(len(centroids))}
+    nearest_of = [0] * len(data_points)
+    inf = float('inf')
+    indexed_centroids = list(enumerate(centroids))
     for idx, point in enumerate(data_points):
-        min_dist = float('inf')
+        min_dist = inf
         nearest = 0
-        for c_idx, centroid in enumerate(centroids):
-            dist = squared_distance(point, centroid)
-            if dist < min_dist:
-                min_dist = dist
+        for c_idx, centroid in indexed_centroids:
+            d = dist(point, centroid)
+            if d < min_dist:
+                min_dist = d
                 nearest = c_idx
+        nearest_of[idx] = nearest
         cluster_map[nearest].append(idx)
-    return cluster_map
+    return cluster_map, nearest_of
+# Cluster Lookup: Read-only assignment of one roster (clusters[c] = player indices of cluster c)
+# Batch callers build it once per roster and pass it to every find_best_match call
+class ClusterLookup(NamedTuple):
+    clusters: Tuple[Tuple[int, ...], ...]
+    nearest_of: Tuple[int, ...]
+
+
+def build_cluster_lookup(data_points: List[List[float]], centroids: List[List[float]]) -> ClusterLookup:
+    """Assign every player once, as immutable tuples that calls can share."""
+    cluster_map, nearest_of = _assign_clusters_with_nearest(data_points, centroids)
+    return ClusterLookup(tuple(map(tuple, cluster_map.values())), tuple(nearest_of))
+
+
 # Shared DDA Instance: Maintains state across requests (preserves momentum/history)
 _dda_instance = DDASystem(stability_threshold=0.05, momentum_factor=0.6)
 
+# Match Result: Record form of a find_best_match result (dicts are built only at the API boundary)
+# The optional fields stay None on the early "no match" paths
+class MatchResult(NamedTuple):
+    player_index: int
+    match_index: Optional[int]
+    match_score: float
+    cluster: Optional[int]
+    w_theta: Optional[float] = None
+    w_beta: Optional[float] = None
+    adjusted_theta: Optional[float] = None
+    adjusted_beta: Optional[float] = None
+    consistency: Optional[float] = None
+
+    def as_dict(self) -> Dict[str, Optional[float]]:
+        """Same dict layout find_best_match has always returned."""
+        result = {
+            "player_index": self.player_index,
+            "match_index": self.match_index,
+            "match_score": self.match_score,
+            "cluster": self.cluster
+        }
+        if self.w_theta is not None:
+            result["adaptive_weights"] = {"theta": self.w_theta, "beta": self.w_beta}
+            result["IRT_Profile"] = {"theta": self.adjusted_theta, "beta": self.adjusted_beta}
+            result["Consistency"] = self.consistency
+        return result
+
+
 # Main Matching Function: Finds best opponent for a player
 def find_best_match(
     player_index: int,
@@ -75,23 +144,37 @@ def find_best_match(
     rank_name: str,
     completed_achievements: int,
     success_count: int,
-    fail_count: int
+    fail_count: int,
+    cluster_lookup: Optional[ClusterLookup] = None
 ) -> Dict[str, Optional[float]]:
     """
     Given a player index plus cluster centroids, return the most compatible
-    opponent using adaptive weights and IRT/DDA adjustments.
+    opponent using adaptive weights and IRT/DDA adjustments. Pass the roster's
+    cluster_lookup when matching several players against the same roster.
     """
+    return _find_best_match(
+        player_index, data_points, centroids, rank_name,
+        completed_achievements, success_count, fail_count, cluster_lookup
+    ).as_dict()
+
+
+def _find_best_match(
+    player_index: int,
+    data_points: List[List[float]],
+    centroids: List[List[float]],
+    rank_name: str,
+    completed_achievements: int,
+    success_count: int,
+    fail_count: int,
+    cluster_lookup: Optional[ClusterLookup] = None
+) -> MatchResult:
+    """find_best_match returning a MatchResult, for batch callers that only read fields."""
     if len(data_points) < 2:
         logging.warning("Not enough players to form a match.")
-        return {
-            "player_index": player_index,
-            "match_index": None,
-            "match_score": 0.0,
-            "cluster": None
-        }
+        return MatchResult(player_index, None, 0.0, None)
     theta, beta_old = data_points[player_index]
     # Recompute student skill using IRT so we capture latest stats.
-    irt_result = irt_probability(
+    irt_result = irt_probability_fast(
         theta=theta,
         beta=beta_old,
         rank_name=rank_name,
@@ -101,46 +184,34 @@ def find_best_match(
     )
 
     # Run DDA to see how the player’s beta should shift based on history.
-    dda_result = _dda_instance.adjust_difficulty(
+    dda_result = _dda_instance.adjust_difficulty_fast(
         beta_old=beta_old,
-        irt_output=irt_result,
+        irt_result=irt_result,
         success_count=success_count,
         fail_count=fail_count
     )
 
-    adjusted_theta = irt_result["adjusted_theta"]
+    adjusted_theta = irt_result.adjusted_theta
     adjusted_beta = dda_result["beta_new"]
-    clusters = assign_clusters(data_points, centroids)
+    if cluster_lookup is None:
+        cluster_lookup = build_cluster_lookup(data_points, centroids)
+    clusters, nearest_of = cluster_lookup
     player_point = data_points[player_index]
-    min_dist = float('inf')
-    player_cluster = 0
-    for c_idx, centroid in enumerate(centroids):
-        dist = squared_distance(player_point, centroid)
-        if dist < min_dist:
-            min_dist = dist
-            player_cluster = c_idx
+    # The assignment pass already found the player's nearest centroid
+    player_cluster = nearest_of[player_index]
 
     candidates = [idx for idx in clusters[player_cluster] if idx != player_index]
     if not candidates:
         # If cluster is empty, expand search to nearest populated clusters.
-        cluster_distances = []
-        for c_idx, centroid in enumerate(centroids):
-            if clusters[c_idx]:
-                dist = squared_distance(player_point, centroid)
-                cluster_distances.append((c_idx, dist))
-        cluster_distances.sort(key=lambda x: x[1])
-        for nearest_idx, _ in cluster_distances:
-            if clusters[nearest_idx]:
-                candidates = clusters[nearest_idx]
-                break
+        # Only the closest populated cluster is used, so a single min() replaces the full sort
+        # (min keeps the first of equal distances, as the stable sort did)
+        populated = [c_idx for c_idx in range(len(centroids)) if clusters[c_idx]]
+        if populated:
+            nearest_idx = min(populated, key=lambda c_idx: squared_distance(player_point, centroids[c_idx]))
+            candidates = clusters[nearest_idx]
     if not candidates:
         logging.warning(f"No candidates found for Player {player_index}.")
-        return {
-            "player_index": player_index,
-            "match_index": None,
-            "match_score": 0.0,
-            "cluster": player_cluster
-        }
+        return MatchResult(player_index, None, 0.0, player_cluster)
     total_attempts = success_count + fail_count
     if total_attempts > 0:
         consistency = normalize(success_count / total_attempts, 0.0, 1.0)
@@ -153,12 +224,7 @@ def find_best_match(
         score = calculate_match_score(adjusted_theta, c_theta, adjusted_beta, c_beta, w_theta, w_beta)
         if score > best_score:
             best_match, best_score = idx, score
-    return {
-        "player_index": player_index,
-        "match_index": best_match,
-        "match_score": round(best_score, 3),
-        "cluster": player_cluster,
-        "adaptive_weights": {"theta": w_theta, "beta": w_beta},
-        "IRT_Profile": {"theta": adjusted_theta, "beta": adjusted_beta},
-        "Consistency": round(consistency, 3)
-    }
+    return MatchResult(
+        player_index, best_match, round(best_score, 3), player_cluster,
+        w_theta, w_beta, adjusted_theta, adjusted_beta, round(consistency, 3)
+    )
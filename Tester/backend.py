@@ -4,10 +4,16 @@ Provides REST endpoints to test Python algorithms from the front-end.
 """
 
 from flask import Flask, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import sys
 import os
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Add parent directory to path to import algorithms
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
@@ -16,7 +22,22 @@ from DDA_Algo import DDASystem
 from Puzzel_Based import run_puzzle_adjustment
 from Multiplayer_Based import MultiplayerMatchmaker, quick_match
 
+
+# JSON Provider: Routes jsonify() through orjson (C encoder) when it is installed
+# Keeps the default provider's sorted keys and debug-mode indent; int dict keys are allowed
+class OrjsonProvider(DefaultJSONProvider):
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+
 app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 CORS(app)  # Enable CORS for front-end requests
 
 # Initialize algorithm instances
@@ -8,21 +8,55 @@ Wraps: Multiplayer_Based.py, SkillBasedMatchMaking.py, KMeans_Cluster.py
 Functions:
 - find_matches: Groups players into balanced teams
 - find_best_match: Finds best opponent for single player
+- find_best_matches_batch: find_best_match for many players sharing one roster
 - cluster_players: Performs clustering only
 
 Usage: Called via child_process with JSON stdin/stdout
+       (or `matchmaking.py --serve` for newline-delimited requests on one long-lived process)
 """
 
 import sys
+import os
 import json
+from operator import itemgetter
 from typing import List, Dict
 
-# Add parent directory to path to import modules
-sys.path.insert(0, '.')
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# JSON I/O: orjson (C encoder/decoder) when installed, stdlib json otherwise.
+# Both read bytes or str and write one newline-terminated UTF-8 document per call.
+if orjson is not None:
+    _loads = orjson.loads
+
+    def _dumps_line(data: Dict) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+else:
+    _loads = json.loads
+
+    def _dumps_line(data: Dict) -> bytes:
+        return (json.dumps(data) + "\n").encode("utf-8")
+
+
+_get_players = itemgetter("players")
+
+
+def _write_json(stream, data: Dict) -> None:
+    """Write one JSON document to a text stream's underlying binary buffer."""
+    stream.flush()
+    stream.buffer.write(_dumps_line(data))
+    stream.buffer.flush()
+
+
+# Add parent directory to path to import modules (resolved from this file, not the caller's cwd)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
 
 try:
     from Multiplayer_Based import MultiplayerMatchmaker, create_matchmaker
-    from SkillBasedMatchMaking import find_best_match
+    from SkillBasedMatchMaking import build_cluster_lookup, find_best_match
     from KMeans_Cluster import kmeans_from_irt
 except ImportError as e:
     print(json.dumps({
@@ -32,121 +66,199 @@ except ImportError as e:
     sys.exit(1)
 
 
-# Main Entry Point: Routes JSON input to appropriate algorithm function
-def main():
-    """Main entry point for matchmaking script"""
-    try:
-        # Read JSON input from stdin
-        input_data = json.load(sys.stdin)
-        
-        function_name = input_data.get('function')
-        args = input_data.get('args', {})
-        
-        # find_matches: Groups players into balanced teams
-        # Process: 1) Pre-compute IRT 2) Cluster players 3) Match within clusters 4) Cross-cluster fallback
-        if function_name == 'find_matches':
-            # Extract parameters from JSON input
-            players = args.get('players', [])
-            match_size = args.get('match_size', 2)  # Players per match (3-5 for ranked)
-            allow_cross_cluster = args.get('allow_cross_cluster', True)  # Allow different ranks
-            min_match_score = args.get('min_match_score', 0.5)  # Minimum quality threshold
-            k_clusters = args.get('k_clusters', 3)  # Number of skill clusters
-            
-            if not players:
-                raise ValueError("players list cannot be empty")
-            
-            # Create matchmaker instance with specified cluster count
-            matchmaker = create_matchmaker(k_clusters=k_clusters)
-            
-            # Execute matchmaking algorithm
-            matches = matchmaker.find_matches(
-                players=players,
-                match_size=match_size,
-                allow_cross_cluster=allow_cross_cluster,
-                min_match_score=min_match_score
-            )
-            
-            # Format output
-            result = {
-                "matches": matches,
-                "total_matches": len(matches),
-                "total_players": len(players),
-                "matched_players": sum(len(m["players"]) for m in matches)
-            }
-            
-            print(json.dumps({
-                "success": True,
-                "result": result
-            }))
-            
-        # find_best_match: Finds best opponent for single player
-        # Process: 1) Identify cluster 2) Search within cluster 3) Fallback to nearest cluster 4) Calculate score
-        elif function_name == 'find_best_match':
-            # Extract parameters
-            player_index = args.get('player_index', 0)  # Index of player seeking match
-            data_points = args.get('data_points', [])  # [theta, beta] pairs for all players
-            centroids = args.get('centroids', [])  # Cluster center points from K-Means
-            rank_name = args.get('rank_name', 'novice')
-            completed_achievements = args.get('completed_achievements', 0)
-            success_count = args.get('success_count', 0)
-            fail_count = args.get('fail_count', 0)
-            
-            if not data_points or not centroids:
-                raise ValueError("data_points and centroids are required")
-            
-            # Execute skill-based matching algorithm
-            match_result = find_best_match(
+# Input Validation: Fail fast at the boundary with a clear message instead of deep in the algorithms
+def _validate_rows(name: str, rows: List, width: int = None) -> None:
+    """Every row must be a list of numbers (of exactly `width` numbers when given)."""
+    for i, row in enumerate(rows):
+        if not isinstance(row, list) or not row or (width is not None and len(row) != width):
+            expected = f"a list of {width} numbers" if width is not None else "a non-empty list of numbers"
+            raise ValueError(f"{name}[{i}] malformed: expected {expected}")
+        for value in row:
+            if type(value) not in (int, float):
+                raise ValueError(f"{name}[{i}] malformed: {value!r} is not a number")
+
+
+def _validate_players(players: List) -> None:
+    for i, player in enumerate(players):
+        if not isinstance(player, dict):
+            raise ValueError(f"players[{i}] malformed: expected an object")
+
+
+# Dispatch: Routes one parsed request to the appropriate algorithm function
+def dispatch(input_data: Dict) -> Dict:
+    """Run one {"function": ..., "args": {...}} request and return its result (raises on bad input)."""
+    function_name = input_data.get('function')
+    args = input_data.get('args', {})
+    
+    # find_matches: Groups players into balanced teams
+    # Process: 1) Pre-compute IRT 2) Cluster players 3) Match within clusters 4) Cross-cluster fallback
+    if function_name == 'find_matches':
+        # Extract parameters from JSON input
+        players = args.get('players', [])
+        match_size = args.get('match_size', 2)  # Players per match (3-5 for ranked)
+        allow_cross_cluster = args.get('allow_cross_cluster', True)  # Allow different ranks
+        min_match_score = args.get('min_match_score', 0.5)  # Minimum quality threshold
+        k_clusters = args.get('k_clusters', 3)  # Number of skill clusters
+        
+        if not players:
+            raise ValueError("players list cannot be empty")
+        _validate_players(players)
+        
+        # Create matchmaker instance with specified cluster count
+        # (fresh per request, so no matchmaker cache state is shared between --serve clients)
+        matchmaker = create_matchmaker(k_clusters=k_clusters)
+        
+        # Execute matchmaking algorithm
+        matches = matchmaker.find_matches(
+            players=players,
+            match_size=match_size,
+            allow_cross_cluster=allow_cross_cluster,
+            min_match_score=min_match_score
+        )
+        
+        # Format output
+        return {
+            "matches": matches,
+            "total_matches": len(matches),
+            "total_players": len(players),
+            "matched_players": sum(map(len, map(_get_players, matches)))
+        }
+        
+    # find_best_match: Finds best opponent for single player
+    # Process: 1) Identify cluster 2) Search within cluster 3) Fallback to nearest cluster 4) Calculate score
+    elif function_name == 'find_best_match':
+        # Extract parameters
+        player_index = args.get('player_index', 0)  # Index of player seeking match
+        data_points = args.get('data_points', [])  # [theta, beta] pairs for all players
+        centroids = args.get('centroids', [])  # Cluster center points from K-Means
+        rank_name = args.get('rank_name', 'novice')
+        completed_achievements = args.get('completed_achievements', 0)
+        success_count = args.get('success_count', 0)
+        fail_count = args.get('fail_count', 0)
+        
+        if not data_points or not centroids:
+            raise ValueError("data_points and centroids are required")
+        _validate_rows("data_points", data_points, width=2)
+        _validate_rows("centroids", centroids)
+        
+        # Execute skill-based matching algorithm
+        match_result = find_best_match(
+            player_index=player_index,
+            data_points=data_points,
+            centroids=centroids,
+            rank_name=rank_name,
+            completed_achievements=completed_achievements,
+            success_count=success_count,
+            fail_count=fail_count
+        )
+        
+        return match_result
+        
+    # find_best_matches_batch: find_best_match for many players against the same roster
+    # One parse of data_points/centroids; the per-roster cluster map is built once and reused
+    elif function_name == 'find_best_matches_batch':
+        # Extract parameters
+        player_indices = args.get('player_indices', [])  # Indices of players seeking a match
+        data_points = args.get('data_points', [])
+        centroids = args.get('centroids', [])
+        player_stats = args.get('player_stats')  # Optional per-player stats, aligned with player_indices
+        
+        if not data_points or not centroids:
+            raise ValueError("data_points and centroids are required")
+        _validate_rows("data_points", data_points, width=2)
+        _validate_rows("centroids", centroids)
+        if player_stats is None:
+            player_stats = [{}] * len(player_indices)
+        elif len(player_stats) != len(player_indices):
+            raise ValueError("player_stats must have one entry per player index")
+        
+        # The roster is the same for every player, so assign clusters once for the whole batch
+        cluster_lookup = build_cluster_lookup(data_points, centroids)
+        results = [
+            find_best_match(
                 player_index=player_index,
                 data_points=data_points,
                 centroids=centroids,
-                rank_name=rank_name,
-                completed_achievements=completed_achievements,
-                success_count=success_count,
-                fail_count=fail_count
-            )
-            
-            print(json.dumps({
-                "success": True,
-                "result": match_result
-            }))
-            
-        # cluster_players: Groups players into clusters without matching
-        # Process: 1) Extract IRT features 2) Normalize 3) K-Means clustering 4) Assign to clusters
-        elif function_name == 'cluster_players':
-            # Extract parameters
-            irt_data = args.get('irt_data', [])  # IRT computation results for each player
-            k = args.get('k', 3)  # Number of clusters to form
-            max_iter = args.get('max_iter', 100)  # Maximum iterations for convergence
-            tol = args.get('tol', 1e-4)  # Convergence tolerance (stops when centroids move < tol)
-            
-            if not irt_data:
-                raise ValueError("irt_data cannot be empty")
-            
-            # Execute K-Means clustering algorithm
-            clustering_result = kmeans_from_irt(
-                irt_data=irt_data,
-                k=k,
-                max_iter=max_iter,
-                tol=tol,
-                verbose=False
+                rank_name=stats.get('rank_name', 'novice'),
+                completed_achievements=stats.get('completed_achievements', 0),
+                success_count=stats.get('success_count', 0),
+                fail_count=stats.get('fail_count', 0),
+                cluster_lookup=cluster_lookup
             )
-            
-            print(json.dumps({
-                "success": True,
-                "result": clustering_result
-            }))
-            
-        else:
-            raise ValueError(f"Unknown function: {function_name}")
-            
+            for player_index, stats in zip(player_indices, player_stats)
+        ]
+        
+        return {"results": results}
+        
+    # cluster_players: Groups players into clusters without matching
+    # Process: 1) Extract IRT features 2) Normalize 3) K-Means clustering 4) Assign to clusters
+    elif function_name == 'cluster_players':
+        # Extract parameters
+        irt_data = args.get('irt_data', [])  # IRT computation results for each player
+        k = args.get('k', 3)  # Number of clusters to form
+        max_iter = args.get('max_iter', 100)  # Maximum iterations for convergence
+        tol = args.get('tol', 1e-4)  # Convergence tolerance (stops when centroids move < tol)
+        
+        if not irt_data:
+            raise ValueError("irt_data cannot be empty")
+        
+        # Execute K-Means clustering algorithm
+        clustering_result = kmeans_from_irt(
+            irt_data=irt_data,
+            k=k,
+            max_iter=max_iter,
+            tol=tol,
+            verbose=False
+        )
+        
+        return clustering_result
+        
+    else:
+        raise ValueError(f"Unknown function: {function_name}")
+
+
+# Main Entry Point: Reads one JSON request from stdin and writes one JSON response
+def main():
+    """Main entry point for matchmaking script"""
+    try:
+        # Read JSON input from stdin
+        input_data = _loads(sys.stdin.buffer.read())
+        result = dispatch(input_data)
+        _write_json(sys.stdout, {
+            "success": True,
+            "result": result
+        })
     except Exception as e:
-        print(json.dumps({
+        _write_json(sys.stderr, {
             "success": False,
             "error": str(e)
-        }), file=sys.stderr)
+        })
         sys.exit(1)
 
 
-if __name__ == '__main__':
-    main()
+# Serve Loop (--serve): Long-lived mode that pays interpreter start-up and imports once
+# Reads newline-delimited JSON requests and writes one NDJSON response per request, in order.
+# Errors are reported in-band ({"success": false, "error": ...}) and the loop keeps running.
+# Module-level state (e.g. SkillBasedMatchMaking's shared DDA instance) persists across requests.
+# Node side: spawn(python, [script, '--serve'], { stdio: ['pipe', 'pipe', 'pipe'] }) once,
+# write JSON.stringify(request) + '\n' per call, and split stdout on '\n'.
+def serve_loop(stdin=None, stdout=None):
+    """Process NDJSON requests until stdin closes (binary streams, one request per line)."""
+    stdin = stdin or sys.stdin.buffer
+    stdout = stdout or sys.stdout.buffer
+    for line in stdin:
+        if not line.strip():
+            continue
+        try:
+            response = {"success": True, "result": dispatch(_loads(line))}
+        except Exception as e:
+            response = {"success": False, "error": str(e)}
+        stdout.write(_dumps_line(response))
+        stdout.flush()
 
+
+if __name__ == '__main__':
+    if '--serve' in sys.argv[1:]:
+        serve_loop()
+    else:
+        main()
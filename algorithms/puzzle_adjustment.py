@@ -7,27 +7,63 @@ import sys
 import json
 import os
 import logging
+import logging.handlers
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Add parent directory to path to import algorithms
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from Puzzel_Based import run_puzzle_adjustment
 
+
+# JSON I/O: orjson (C encoder/decoder) when installed, stdlib json otherwise
+if orjson is not None:
+    _loads = orjson.loads
+
+    def _dumps_line(data: dict) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+else:
+    _loads = json.loads
+
+    def _dumps_line(data: dict) -> bytes:
+        return (json.dumps(data) + "\n").encode("utf-8")
+
+
+def _print_json(data: dict) -> None:
+    """Write one newline-terminated JSON document to stdout."""
+    sys.stdout.flush()
+    sys.stdout.buffer.write(_dumps_line(data))
+    sys.stdout.buffer.flush()
+
+
+# Logging: stderr only (stdout stays clean JSON for Node), level from LOG_LEVEL (default INFO).
+# Records are buffered and written in one go at exit, or immediately on ERROR.
+def _configure_logging() -> logging.Logger:
+    level = getattr(logging, os.environ.get("LOG_LEVEL", "INFO").upper(), logging.INFO)
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+    handler = logging.handlers.MemoryHandler(capacity=64, flushLevel=logging.ERROR, target=stream_handler)
+    logging.basicConfig(level=level, handlers=[handler])
+    return logging.getLogger("puzzle_adjustment")
+
+
 def main():
     """Main entry point for puzzle adjustment"""
-    # Configure logging to stderr so stdout stays clean JSON for Node
-    logging.basicConfig(stream=sys.stderr, level=logging.INFO)
+    logger = _configure_logging()
     try:
         # Read input from stdin (JSON)
-        input_data = json.loads(sys.stdin.read())
-        try:
-            logging.info({"event": "puzzle_adjust_input", "payload": input_data})
-        except Exception:
-            pass
+        input_data = _loads(sys.stdin.buffer.read())
 
         # Extract parameters
         user_id = input_data.get('user_id', 'unknown_user')
         level_id = input_data.get('level_id', 'unknown_level')
+        # %-style args are only formatted if the record is emitted; the full payload is DEBUG-only
+        logger.info("puzzle_adjust_input user=%s level=%s", user_id, level_id)
+        logger.debug("puzzle_adjust_input payload=%s", input_data)
         theta = float(input_data.get('theta', 0.0))
         beta_old = float(input_data.get('beta_old', 0.5))
         rank_name = input_data.get('rank_name', 'novice')
@@ -59,20 +95,15 @@ def main():
             "success": True,
             "result": result
         }
-        try:
+        if logger.isEnabledFor(logging.INFO):
             # Log a compact summary to stderr
             summary = result.get("Summary") or result.get("summary") or {}
-            logging.info({
-                "event": "puzzle_adjust_output",
-                "user_id": user_id,
-                "level_id": level_id,
-                "beta_new": summary.get("New_Beta"),
-                "difficulty": summary.get("Next_Puzzle_Difficulty"),
-                "student_skill": summary.get("Student_Skill"),
-            })
-        except Exception:
-            pass
-        print(json.dumps(output))
+            logger.info(
+                "puzzle_adjust_output user=%s level=%s beta_new=%s difficulty=%s student_skill=%s",
+                user_id, level_id, summary.get("New_Beta"),
+                summary.get("Next_Puzzle_Difficulty"), summary.get("Student_Skill")
+            )
+        _print_json(output)
 
     except Exception as e:
         # Output error as JSON
@@ -80,12 +111,9 @@ def main():
             "success": False,
             "error": str(e)
         }
-        # Also try to log the error to stderr
-        try:
-            logging.exception({"event": "puzzle_adjust_error", "error": str(e)})
-        except Exception:
-            pass
-        print(json.dumps(error_output))
+        # Also log the error to stderr (logging reports its own handler failures)
+        logger.exception("puzzle_adjust_error error=%s", e)
+        _print_json(error_output)
         sys.exit(1)
 
 if __name__ == '__main__':
@@ -1,5 +1,6 @@
 import math
 from DDA_Algo import DDASystem
+from IRT_Algo import IRTModel, irt_probability_fast
 from algo_config import difficulty_from_beta, EASY_MAX, MEDIUM_MAX, MAX_BETA_STEP, clamp_beta
 
 
@@ -57,3 +58,27 @@ def test_monotonic_response_to_performance_gap():
 	assert res_bad["beta_new"] > beta_old  # should increase difficulty when underperforming
 	assert res_good["beta_new"] < beta_old  # should decrease difficulty when overperforming
 
+
+def test_fast_path_matches_dict_path():
+	irt = IRTModel().compute_full_irt_fast(theta=0.4, beta=0.5, success_count=6, fail_count=3)
+	res_fast = DDASystem().adjust_difficulty_fast(beta_old=0.5, irt_result=irt, success_count=6, fail_count=3)
+	res_dict = DDASystem().adjust_difficulty(beta_old=0.5, irt_output=irt._asdict(), success_count=6, fail_count=3)
+	assert res_fast == res_dict
+
+	probability_record = irt_probability_fast(theta=0.4, beta=0.5, success_count=6, fail_count=3)
+	res_fast = DDASystem().adjust_difficulty_fast(beta_old=0.5, irt_result=probability_record, success_count=6, fail_count=3)
+	res_dict = DDASystem().adjust_difficulty(beta_old=0.5, irt_output=probability_record._asdict(), success_count=6, fail_count=3)
+	assert res_fast == res_dict
+
+
+def test_stateless_adjust_matches_stateful_sequence():
+	shared = DDASystem()
+	pure = DDASystem()
+	state = None
+	for prob, s, f in [(0.2, 0, 5), (0.4, 2, 3), (0.9, 6, 1)]:
+		irt = make_irt(probability=prob, theta=0.3)
+		expected = shared.adjust_difficulty(beta_old=0.5, irt_output=irt, success_count=s, fail_count=f)
+		res, state = pure.adjust_difficulty_stateless(beta_old=0.5, irt_output=irt, success_count=s, fail_count=f, state=state)
+		assert res == expected
+	assert state.previous_beta == shared._previous_beta
+	assert state.momentum == shared._momentum
@@ -0,0 +1,9 @@
+from RankBases.EXP import BASE_EXP_GAIN, DIFFICULTY_MULTIPLIER, calculate_exp_gain
+
+
+def test_exp_gain_table_matches_formula():
+	for difficulty_level, multiplier in enumerate(DIFFICULTY_MULTIPLIER):
+		for streak in range(101):
+			expected = int(BASE_EXP_GAIN * multiplier * (1 + 0.05 * streak))
+			assert calculate_exp_gain(True, difficulty_level, streak) == expected
+			assert calculate_exp_gain(False, difficulty_level, streak) == 0
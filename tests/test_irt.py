@@ -0,0 +1,75 @@
+from IRT_Algo import IRTModel, batch_irt_probability, irt_probability
+
+
+def test_compute_full_irt_batch_matches_scalar():
+	model = IRTModel()
+	thetas = [-4.0, -0.5, 0.0, 1.2, 3.5]
+	betas = [0.05, 0.3, 0.5, 0.8, 1.4]
+	success_counts = [0, 3, 10, 60, -1]
+	fail_counts = [0, 7, 2, 55, 120]
+	sessions = [1, 2, 0, 5, 3]
+	prev_thetas = [None, 0.4, None, -0.2, 1.0]
+	exps = [None, 0, 2500, None, 10000]
+
+	batch = model.compute_full_irt_batch(
+		thetas, betas, success_counts, fail_counts,
+		sessions_played=sessions, prev_thetas=prev_thetas, exps=exps,
+	)
+	for i, result in enumerate(batch):
+		expected = model.compute_full_irt(
+			theta=thetas[i],
+			beta=betas[i],
+			success_count=success_counts[i],
+			fail_count=fail_counts[i],
+			sessions_played=sessions[i],
+			prev_theta=prev_thetas[i],
+			exp=exps[i],
+		)
+		assert result == expected
+
+
+def test_learning_decay_accepts_float_sessions():
+	model = IRTModel()
+	assert model.apply_learning_decay(1.5, 3.0) == model.apply_learning_decay(1.5, 3) == round(1.5 * (1 - 0.01 * 3), 3)
+	assert model.apply_learning_decay(1.5, 2.5) == round(1.5 * (1 - 0.01 * 2.5), 3)
+
+	batch = model.compute_full_irt_batch([0.8], [0.5], [6], [2], sessions_played=[3.0])
+	assert batch == [model.compute_full_irt(theta=0.8, beta=0.5, success_count=6, fail_count=2, sessions_played=3.0)]
+
+
+def test_compute_full_irt_batch_rejects_ragged_input():
+	model = IRTModel()
+	try:
+		model.compute_full_irt_batch([0.0, 1.0], [0.5], [1, 1], [0, 0])
+	except ValueError:
+		return
+	raise AssertionError("expected ValueError for mismatched lengths")
+
+
+def test_compute_full_irt_fast_matches_dict_api():
+	model = IRTModel()
+	kwargs = dict(user_id="u1", theta=0.8, beta=0.4, success_count=12, fail_count=4, sessions_played=3, prev_theta=0.5)
+	fast = model.compute_full_irt_fast(**kwargs)
+	assert fast._asdict() == model.compute_full_irt(**kwargs)
+
+
+def test_batch_irt_probability_matches_scalar():
+	thetas = [-4.0, 0.0, 1.5, 2.9]
+	betas = [0.0, 0.5, 0.9, 2.0]
+	achievements = [0, 7, -1, 40]
+	success_counts = [0, 12, 60, -2]
+	fail_counts = [0, 4, 55, 9]
+
+	adjusted, probabilities = batch_irt_probability(
+		thetas, betas, achievements, success_counts, fail_counts
+	)
+	for i in range(len(thetas)):
+		expected = irt_probability(
+			theta=thetas[i],
+			beta=betas[i],
+			completed_achievements=achievements[i],
+			success_count=success_counts[i],
+			fail_count=fail_counts[i],
+		)
+		assert adjusted[i] == expected["adjusted_theta"]
+		assert probabilities[i] == expected["probability"]
@@ -0,0 +1,84 @@
+import random
+
+import pytest
+
+import SkillBasedMatchMaking
+from DDA_Algo import DDASystem
+from Multiplayer_Based import MultiplayerMatchmaker, _group_variance
+from SkillBasedMatchMaking import _find_best_match, assign_clusters, build_cluster_lookup
+
+
+def test_cluster_lookup_is_read_only_copy_of_assignment():
+	points = [[0.0, 0.1], [0.2, 0.3], [2.0, 0.9], [2.1, 0.8]]
+	centroids = [[0.1, 0.2], [2.0, 0.85]]
+	lookup = build_cluster_lookup(points, centroids)
+	assert lookup == (((0, 1), (2, 3)), (0, 0, 1, 1))
+	assert all(isinstance(cluster, tuple) for cluster in lookup.clusters)
+	assert {c: list(members) for c, members in enumerate(lookup.clusters)} == assign_clusters(points, centroids)
+
+
+def test_find_best_match_with_shared_lookup_matches_fresh_assignment(monkeypatch):
+	points = [[0.0, 0.1], [0.2, 0.3], [2.0, 0.9], [2.1, 0.8], [5.0, 0.5]]
+	centroids = [[0.1, 0.2], [2.0, 0.85], [9.0, 0.5]]
+	lookup = build_cluster_lookup(points, centroids)
+	for player_index in range(len(points)):
+		args = (player_index, points, centroids, "novice", 2, 5, 3)
+		# Fresh DDA state per call, so only the cluster assignment source differs
+		monkeypatch.setattr(SkillBasedMatchMaking, "_dda_instance", DDASystem(0.05, 0.6))
+		shared = _find_best_match(*args, cluster_lookup=lookup)
+		monkeypatch.setattr(SkillBasedMatchMaking, "_dda_instance", DDASystem(0.05, 0.6))
+		assert shared == _find_best_match(*args)
+
+
+def test_assign_clusters_accepts_wider_centroids():
+	# Clustering centroids carry four features while data points are [theta, beta]
+	points = [[0.0, 0.1], [2.0, 0.9]]
+	centroids = [[0.1, 0.2, 0.5, 0.5], [2.0, 0.85, 0.5, 0.5]]
+	assert assign_clusters(points, centroids) == {0: [0], 1: [1]}
+
+
+def test_assign_clusters_rejects_narrower_centroids():
+	with pytest.raises(ValueError):
+		assign_clusters([[0.0, 0.1], [2.0, 0.9]], [[0.1], [2.0]])
+
+
+def test_find_matches_keeps_first_window_among_tied_thetas():
+	# Players with default stats share one theta; the earliest tied window must win
+	random.seed(0)
+	players = [{"user_id": "s0", "theta": -0.3, "success_count": 8, "fail_count": 9}]
+	players += [{"user_id": f"p{i}"} for i in range(1, 5)]
+	matches = MultiplayerMatchmaker(k_clusters=1).find_matches(players, 3, min_match_score=0.0)
+	assert [[p["user_id"] for p in m["players"]] for m in matches] == [["p1", "p2", "p3"]]
+
+
+def test_best_window_matches_two_pass_scan():
+	# The sliding-sum scan must pick the same window as scoring every window two-pass
+	rng = random.Random(3)
+	matchmaker = MultiplayerMatchmaker()
+	for trial in range(500):
+		decimals = (1, 3, None)[trial % 3]
+		thetas = sorted(
+			rng.uniform(-3, 3) if decimals is None else round(rng.uniform(-3, 3), decimals)
+			for _ in range(rng.randint(1, 40))
+		)
+		match_size = rng.choice((1, 3, 4, 5))
+		expected = None
+		if len(thetas) >= match_size:
+			variances = [
+				_group_variance(thetas[start:start + match_size])
+				for start in range(len(thetas) - match_size + 1)
+			]
+			best = min(variances)
+			expected = (variances.index(best), best)
+		assert matchmaker._find_best_window(thetas, match_size, 0.0) == expected
+
+
+def test_find_matches_returns_current_request_players():
+	matchmaker = MultiplayerMatchmaker(k_clusters=1)
+	first = [{"user_id": f"p{i}", "session": "old"} for i in range(4)]
+	second = [{"user_id": f"p{i}", "session": "new"} for i in range(4)]
+	random.seed(0)
+	matchmaker.find_matches(first, 2, min_match_score=0.0)
+	random.seed(0)
+	matches = matchmaker.find_matches(second, 2, min_match_score=0.0)
+	assert matches and all(p["session"] == "new" for m in matches for p in m["players"])
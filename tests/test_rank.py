@@ -0,0 +1,27 @@
+from IRT_Bases.Rank import PlayerRank, RankRegistry
+from RankBases.EXP import get_normalized_exp
+
+
+def test_registry_matches_player_rank():
+	exps = [-50, 0, 120, 900, 2500, 4800, 7000, 9999, 10000, 25000]
+	registry = RankRegistry()
+	players = []
+	for i in range(len(exps)):
+		registry.add(f"p{i}")
+		players.append(PlayerRank(f"p{i}"))
+	registry.lock_rank(3)
+	players[3].lock_rank()
+
+	registry.update_from_exp_bulk(exps)
+	for player, exp in zip(players, exps):
+		player.update_from_exp(get_normalized_exp(max(exp, 0)))
+	registry.promote_bulk(range(0, len(exps), 2), steps=2)
+	registry.demote_bulk([1, 3, 9])
+	for i in range(0, len(exps), 2):
+		players[i].promote(2)
+	for i in (1, 3, 9):
+		players[i].demote()
+
+	for i, player in enumerate(players):
+		assert registry.get_status(i) == player.get_status()
+	assert registry.rank_names() == [p.get_status().rank for p in players]
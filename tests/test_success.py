@@ -0,0 +1,45 @@
+import random
+from math import exp, sqrt
+
+from IRT_Bases.Success import DECAY_RATE, DEFAULT_TIER, MAX_ATTEMPTS, SUCCESS_TIERS, compute_success
+
+
+def reference_success(puzzle_success, battle_success, gameplay_score, lesson_outcome, engagement_rate):
+	# The original uncached formula (exp logistic, tier scan)
+	puzzle_norm = min(puzzle_success / MAX_ATTEMPTS, 1.0)
+	battle_norm = min(battle_success / MAX_ATTEMPTS, 1.0)
+	weighted_success = (
+		(0.35 * puzzle_norm) +
+		(0.25 * battle_norm) +
+		(0.15 * gameplay_score) +
+		(0.15 * lesson_outcome) +
+		(0.10 * (engagement_rate * DECAY_RATE))
+	)
+	weighted_success = max(0.0, min(weighted_success, 1.0))
+	success_count_equiv = int(weighted_success * MAX_ATTEMPTS)
+	tier = next((t for t in SUCCESS_TIERS if t["min"] <= success_count_equiv <= t["max"]), DEFAULT_TIER)
+	dynamic_bias = tier["bias"] + (sqrt(weighted_success) * 0.02)
+	normalized = 1 / (1 + exp(-6 * (weighted_success - 0.5)))
+	return (
+		tier["level"],
+		round(weighted_success, 4),
+		round(dynamic_bias, 4),
+		round(normalized, 4),
+		(
+			round(puzzle_norm, 3),
+			round(battle_norm, 3),
+			round(gameplay_score, 3),
+			round(lesson_outcome, 3),
+			round(engagement_rate, 3),
+		),
+	)
+
+
+def test_compute_success_matches_reference_formula():
+	rng = random.Random(7)
+	for _ in range(2000):
+		args = (
+			rng.randint(0, 150), rng.randint(0, 150),
+			rng.random(), rng.random(), rng.random(),
+		)
+		assert compute_success(*args) == reference_success(*args)